@@ -0,0 +1,349 @@
+import subprocess
+import psutil
+import time
+import logging
+import os
+import sys
+from typing import Optional
+if sys.platform == 'win32':
+    import winreg  # 用于在Windows注册表中搜索应用
+else:
+    winreg = None
+from app_locator import AppLocator, LocateTask
+from process_monitor import ProcessMonitor
+from auto_close import AutoCloseScheduler, IdlePolicy
+from log_service import log_event, setup_logging, timed
+
+class AppController:
+    """应用程序控制器，用于管理外部应用程序的启动和关闭"""
+    
+    def __init__(self, app_name: str, app_path: str = None):
+        """
+        初始化应用程序控制器
+        
+        Args:
+            app_name (str): 应用程序名称（例如：'bamboo.exe'）
+            app_path (str, optional): 应用程序的完整路径，如果提供则优先使用
+        """
+        self.app_name = app_name
+        
+        # 设置日志
+        self._setup_logging()
+        
+        # 可执行文件查找器（带持久化缓存）
+        self.locator = AppLocator()
+        self.locate_task: Optional[LocateTask] = None
+        
+        # 如果提供了路径，验证路径是否有效
+        if app_path and os.path.exists(app_path):
+            self.app_path = app_path
+            self.logger.info(f"使用指定路径: {self.app_path}")
+        else:
+            # 如果路径无效或未提供，先做廉价查找，找不到再在后台遍历磁盘
+            if app_path:
+                self.logger.warning(f"指定的路径无效: {app_path}，将尝试自动搜索")
+            self.app_path = self.locator.find_quick(app_name)
+            
+            if self.app_path:
+                self.logger.info(f"找到应用程序路径: {self.app_path}")
+            else:
+                self.discover_app_path()
+        
+        self.process: Optional[subprocess.Popen] = None
+        self.start_time: Optional[float] = None
+        
+        # 后台跟踪切片软件进程，状态查询不再遍历进程表
+        self.monitor = ProcessMonitor(app_name)
+        self.monitor.start()
+        
+        # 所有定时关闭共用一个调度线程
+        self.scheduler = AutoCloseScheduler()
+        self.scheduler.start()
+        self._auto_close_minutes = 0
+        self._auto_close_sessions = set()
+        # 空闲多少分钟后提前关闭，0 表示不启用空闲检测（由管理员窗口从 admin_config.json 加载，对之后的启动生效）
+        self.idle_close_minutes = 0
+        self.monitor.subscribe(self._on_process_event)
+    
+    @property
+    def auto_close_minutes(self) -> int:
+        """定时关闭时间（分钟），0 表示不自动关闭"""
+        return self._auto_close_minutes
+    
+    @auto_close_minutes.setter
+    def auto_close_minutes(self, minutes: int):
+        """修改定时关闭时间，正在进行的会话按新时间（从会话开始计算）改期"""
+        self._auto_close_minutes = minutes
+        delay = minutes * 60 if minutes > 0 else None
+        for session_id in list(self._auto_close_sessions):
+            if not self.scheduler.reschedule(session_id, delay, from_start=True):
+                self._auto_close_sessions.discard(session_id)
+        if self._auto_close_sessions:
+            self.logger.info(f"定时关闭时间已修改为 {minutes} 分钟，当前会话已改期")
+    
+    def _on_process_event(self, event, snapshot):
+        """记录进程事件，应用程序退出后取消尚未到期的自动关闭"""
+        log_event(f'app_{event}', process_name=self.app_name, pids=sorted(snapshot.pids))
+        if event == ProcessMonitor.EXITED:
+            for session_id in list(self._auto_close_sessions):
+                self.scheduler.cancel(session_id)
+            self._auto_close_sessions.clear()
+    
+    @timed('find_app_path')
+    def _find_app_path(self, app_name: str) -> Optional[str]:
+        """
+        在系统中搜索应用程序的完整路径（同步执行，会阻塞调用线程）
+        
+        Args:
+            app_name (str): 应用程序名称
+            
+        Returns:
+            Optional[str]: 应用程序的完整路径，如果未找到则返回None
+        """
+        try:
+            return self.locator.find(app_name)
+        except Exception as e:
+            self.logger.error(f"搜索应用程序时发生错误: {str(e)}")
+            return None
+    
+    def discover_app_path(self, on_progress=None, on_done=None) -> LocateTask:
+        """
+        在后台线程中搜索应用程序，找到后更新 app_path
+        
+        Args:
+            on_progress (callable, optional): 进度回调 (已扫描目录数, 当前目录)，在后台线程中调用
+            on_done (callable, optional): 完成回调，参数为找到的路径或None，在后台线程中调用
+            
+        Returns:
+            LocateTask: 可用于取消的任务句柄
+        """
+        # 已有搜索在进行时直接复用
+        if self.locate_task and not self.locate_task.is_done():
+            return self.locate_task
+        
+        def done(path):
+            if path:
+                self.app_path = path
+                self.logger.info(f"找到应用程序路径: {path}")
+            if on_done:
+                on_done(path)
+        
+        self.logger.info(f"开始在后台搜索应用程序: {self.app_name}")
+        self.locate_task = self.locator.find_async(self.app_name, on_progress=on_progress, on_done=done)
+        return self.locate_task
+    
+    def _setup_logging(self):
+        """配置日志系统（日志经队列异步写入 app_controller.log）"""
+        self.logger = logging.getLogger('AppController')
+        self.logger.setLevel(logging.INFO)
+        setup_logging('.venv/logs')
+    
+    @timed('start_app')
+    def start_app(self, app_path: str = None) -> bool:
+        """
+        启动应用程序
+        
+        Args:
+            app_path (str, optional): 应用程序路径，如果不提供则使用初始化时的路径
+            
+        Returns:
+            bool: 启动成功返回True，否则返回False
+        """
+        try:
+            # 检查应用是否已经在运行
+            if self.is_running(self.app_name):
+                self.logger.info(f"应用程序已在运行: {self.app_name}")
+                return True  # 直接返回True，不显示提示
+            
+            # 首先尝试使用指定路径启动
+            path_to_use = app_path or self.app_path
+            if path_to_use and os.path.exists(path_to_use):
+                self.process = subprocess.Popen(path_to_use)
+                self.start_time = time.time()
+                self.monitor.track(self.process.pid, self.process)
+                self.logger.info(f"应用程序已启动: {path_to_use}")
+                log_event('app_started', path=path_to_use, pid=self.process.pid)
+                self.locator.remember(self.app_name, path_to_use)
+                
+                # 启动定时关闭功能
+                self._start_auto_close_timer()
+                
+                return True
+            
+            # 如果指定路径无效，只做廉价查找，避免阻塞界面
+            self.logger.warning(f"指定路径无效: {path_to_use}，尝试搜索应用程序")
+            found_path = self.locator.find_quick(self.app_name)
+            
+            if found_path:
+                self.app_path = found_path  # 更新找到的路径
+                self.process = subprocess.Popen(found_path)
+                self.start_time = time.time()
+                self.monitor.track(self.process.pid, self.process)
+                self.logger.info(f"通过搜索找到并启动应用程序: {found_path}")
+                log_event('app_started', path=found_path, pid=self.process.pid)
+                
+                # 启动定时关闭功能
+                self._start_auto_close_timer()
+                
+                return True
+            
+            # 如果都失败了，在后台继续搜索，记录错误并返回
+            self.discover_app_path()
+            self.logger.error("无法找到或启动应用程序")
+            return False
+            
+        except Exception as e:
+            self.logger.error(f"启动应用程序失败: {str(e)}")
+            return False
+    
+    def _start_auto_close_timer(self):
+        """为本次启动登记定时关闭和空闲检测"""
+        delay = self.auto_close_minutes * 60 if self.auto_close_minutes > 0 else None
+        idle_policy = IdlePolicy(self.idle_close_minutes * 60) if self.idle_close_minutes > 0 else None
+        if delay is None and idle_policy is None:
+            return
+        
+        # 关闭的是本次启动的进程，而不是到期时的 self.process
+        process = self.process
+        session_id = self.scheduler.schedule(
+            delay,
+            lambda: self._close_app(process, session_id),
+            pids=[process.pid],
+            idle_policy=idle_policy
+        )
+        self._auto_close_sessions.add(session_id)
+        if delay is not None:
+            self.logger.info(f"应用程序将在 {self.auto_close_minutes} 分钟后自动关闭")
+
+    def _close_app(self, process: Optional[subprocess.Popen] = None, session_id: Optional[int] = None):
+        """关闭应用程序"""
+        self._auto_close_sessions.discard(session_id)
+        process = process or self.process
+        if process and process.poll() is None:
+            process.terminate()
+            self.logger.info("应用程序已自动关闭")
+    
+    @timed('close_app')
+    def close_app(self, process_name: str = None) -> bool:
+        """
+        关闭应用程序
+        
+        Args:
+            process_name (str, optional): 进程名称，如果不提供则使用启动的进程
+            
+        Returns:
+            bool: 关闭成功返回True，否则返回False
+        """
+        try:
+            if process_name and process_name == self.monitor.process_name:
+                # 关闭很少发生，先同步扫描一次，包括上次完整扫描之后启动的实例
+                found = self.monitor.scan()
+                procs = []
+                for pid in set(found) | set(self.monitor.running_pids):
+                    try:
+                        proc = psutil.Process(pid)
+                        # 先取得进程对象再核对创建时间，PID 已被其他进程复用时跳过
+                        if pid in found:
+                            same = proc.create_time() == found[pid]
+                        else:
+                            same = self.monitor.is_alive(pid)
+                        if not same:
+                            continue
+                        proc.terminate()
+                        procs.append(proc)
+                    except psutil.NoSuchProcess:
+                        continue
+                _, alive = psutil.wait_procs(procs, timeout=5)
+                self.monitor.refresh()
+                if alive:
+                    self.logger.error(f"关闭进程超时: {process_name} (PID: {sorted(p.pid for p in alive)})")
+                    return False
+                self.logger.info(f"已关闭进程: {process_name}")
+                log_event('app_stopped', process_name=process_name)
+                return True
+            
+            elif process_name:
+                # 通过进程名关闭
+                for proc in psutil.process_iter(['name']):
+                    if proc.info['name'] == process_name:
+                        proc.terminate()
+                        proc.wait(timeout=5)
+                        self.logger.info(f"已关闭进程: {process_name}")
+                return True
+            
+            elif self.process:
+                # 关闭启动的进程
+                self.process.terminate()
+                self.process.wait(timeout=5)
+                self.logger.info("已关闭启动的应用程序")
+                log_event('app_stopped', pid=self.process.pid)
+                return True
+            
+            else:
+                raise ValueError("没有可关闭的应用程序")
+            
+        except Exception as e:
+            self.logger.error(f"关闭应用程序失败: {str(e)}")
+            return False
+    
+    @timed('is_running')
+    def is_running(self, process_name: str = None) -> bool:
+        """
+        检查应用程序是否在运行
+        
+        Args:
+            process_name (str, optional): 进程名称，如果不提供则检查启动的进程
+            
+        Returns:
+            bool: 如果程序在运行返回True，否则返回False
+        """
+        try:
+            if process_name and process_name == self.monitor.process_name:
+                # 被监视的进程直接读取监视器快照
+                return self.monitor.is_running
+            
+            elif process_name:
+                # 通过进程名检查
+                for proc in psutil.process_iter(['name']):
+                    if proc.info['name'] == process_name:
+                        return True
+                return False
+            
+            elif self.process:
+                # 检查启动的进程
+                return self.process.poll() is None
+            
+            return False
+            
+        except Exception as e:
+            self.logger.error(f"检查应用程序状态失败: {str(e)}")
+            return False
+    
+    def get_running_time(self) -> Optional[float]:
+        """
+        获取应用程序运行时间（秒）
+        
+        Returns:
+            float or None: 运行时间（秒），如果程序未运行则返回None
+        """
+        # 优先使用监视器记录的会话开始时间，也能覆盖不是由本程序启动的实例
+        started_at = self.monitor.session_started_at
+        if started_at:
+            return time.time() - started_at
+        if self.start_time and self.is_running():
+            return time.time() - self.start_time
+        return None
+    
+    def auto_close_after(self, minutes: int, process_name: str = None):
+        """
+        设置定时关闭
+        
+        Args:
+            minutes (int): 多少分钟后关闭
+            process_name (str, optional): 要关闭的进程名称
+            
+        Returns:
+            int: 会话ID，可用于 scheduler.cancel() 取消
+        """
+        # 交给调度线程执行，不再为每次调用单独创建线程
+        return self.scheduler.schedule(minutes * 60, lambda: self.close_app(process_name)) 
\ No newline at end of file
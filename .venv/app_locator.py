@@ -0,0 +1,387 @@
+import json
+import logging
+import os
+import queue
+import stat
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from log_service import timed
+
+# 已知应用的安装目录名，用于在常见安装路径下直接定位
+KNOWN_INSTALL_HINTS = {
+    'bambu-studio.exe': ['Bambu Studio', 'BambuStudio'],
+}
+
+# 遍历磁盘时跳过的目录（不区分大小写）
+SKIP_DIRS = {
+    '$recycle.bin', 'system volume information', 'windows', 'winsxs', 'recovery',
+    'programdata', 'temp', 'tmp', 'cache', 'caches', '__pycache__', 'node_modules',
+    '.git', '.svn', '.hg', '.venv', 'venv', 'site-packages', 'dist-packages',
+    'steamapps', 'msocache', 'perflogs',
+}
+
+
+class LocateTask:
+    """后台查找任务的句柄"""
+
+    def __init__(self):
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.result: Optional[str] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def cancel(self):
+        """取消查找"""
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def is_done(self) -> bool:
+        return self.done_event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """等待查找结束并返回结果"""
+        self.done_event.wait(timeout)
+        return self.result
+
+
+class AppLocator:
+    """可执行文件查找器
+
+    查找顺序：持久化缓存 → 已知安装目录和 PATH → 常见安装目录 → 其他磁盘。
+    目录遍历按批次分发到线程池（每个任务连续扫描一批目录），限制深度并
+    跳过大型系统目录，找到第一个匹配即取消其余扫描。
+    """
+
+    # 每个扫描任务连续扫描的目录数
+    SCAN_BATCH = 256
+
+    def __init__(self, cache_file: str = '.venv/data/app_paths.json',
+                 max_depth: int = 6, max_workers: int = 1,
+                 install_dirs: Optional[List[str]] = None,
+                 drive_roots: Optional[List[str]] = None):
+        """
+        初始化查找器
+
+        Args:
+            cache_file (str): 查找结果缓存文件路径
+            max_depth (int): 遍历目录的最大深度
+            max_workers (int): 扫描目录的线程数；本地磁盘上单线程最快，
+                网络驱动器等高延迟目录可以调大
+            install_dirs (list, optional): 常见安装目录，默认取环境变量
+            drive_roots (list, optional): 最后遍历的磁盘根目录
+        """
+        self.cache_file = cache_file
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        self.install_dirs = install_dirs if install_dirs is not None else [
+            os.environ.get('ProgramFiles', 'C:/Program Files'),
+            os.environ.get('ProgramFiles(x86)', 'C:/Program Files (x86)'),
+            os.environ.get('LOCALAPPDATA', ''),
+            os.environ.get('APPDATA', ''),
+        ]
+        self.drive_roots = drive_roots if drive_roots is not None else ['D:/', 'E:/']
+        self.logger = logging.getLogger('AppController')
+        self._cache_lock = threading.Lock()
+        self._cache = self._load_cache()
+
+    # ------------------------------------------------------------------
+    # 缓存
+    # ------------------------------------------------------------------
+    def _load_cache(self) -> Dict[str, str]:
+        """加载缓存文件"""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"加载应用路径缓存失败: {str(e)}")
+        return {}
+
+    def _save_cache(self):
+        """原子地写入缓存文件"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_file) or '.', exist_ok=True)
+            tmp_file = f'{self.cache_file}.{os.getpid()}.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._cache, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except Exception as e:
+            self.logger.warning(f"保存应用路径缓存失败: {str(e)}")
+
+    def remember(self, app_name: str, path: str):
+        """将查找结果写入缓存"""
+        with self._cache_lock:
+            if self._cache.get(app_name.lower()) == path:
+                return
+            self._cache[app_name.lower()] = path
+            self._save_cache()
+
+    def cached(self, app_name: str) -> Optional[str]:
+        """
+        返回缓存中的路径（通过一次 stat 确认文件仍然存在）
+
+        Returns:
+            Optional[str]: 有效的缓存路径，否则返回 None
+        """
+        with self._cache_lock:
+            path = self._cache.get(app_name.lower())
+        if path and self._is_file(path):
+            return path
+        if path:
+            with self._cache_lock:
+                self._cache.pop(app_name.lower(), None)
+                self._save_cache()
+        return None
+
+    @staticmethod
+    def _is_file(path: str) -> bool:
+        try:
+            return stat.S_ISREG(os.stat(path).st_mode)
+        except OSError:
+            return False
+
+    # ------------------------------------------------------------------
+    # 查找
+    # ------------------------------------------------------------------
+    def find_quick(self, app_name: str, hints: Iterable[str] = ()) -> Optional[str]:
+        """
+        只做廉价检查：缓存、已知安装位置和 PATH，不遍历磁盘
+
+        Args:
+            app_name (str): 应用程序名称
+            hints (Iterable[str]): 额外的候选完整路径
+
+        Returns:
+            Optional[str]: 找到的路径，否则返回 None
+        """
+        path = self.cached(app_name)
+        if path:
+            return path
+
+        for candidate in self._hint_paths(app_name, hints):
+            if self._is_file(candidate):
+                self.remember(app_name, candidate)
+                return candidate
+
+        path = self._search_path_env(app_name)
+        if path:
+            self.remember(app_name, path)
+        return path
+
+    def find(self, app_name: str, hints: Iterable[str] = (),
+             cancel_event: Optional[threading.Event] = None,
+             on_progress: Optional[Callable[[int, str], None]] = None) -> Optional[str]:
+        """
+        按优先级完整查找应用程序（会阻塞，GUI 中请使用 find_async）
+
+        Args:
+            app_name (str): 应用程序名称
+            hints (Iterable[str]): 额外的候选完整路径
+            cancel_event (threading.Event, optional): 置位后中止查找
+            on_progress (callable, optional): 进度回调 (已扫描目录数, 当前目录)
+
+        Returns:
+            Optional[str]: 找到的路径，否则返回 None
+        """
+        path = self.find_quick(app_name, hints)
+        if path:
+            return path
+
+        cancel_event = cancel_event or threading.Event()
+        for roots in (self.install_dirs, self.drive_roots):
+            if cancel_event.is_set():
+                return None
+            path = self._walk(app_name, roots, cancel_event, on_progress)
+            if path:
+                self.logger.info(f"找到匹配的应用程序: {path}")
+                self.remember(app_name, path)
+                return path
+
+        self.logger.warning(f"未找到应用程序: {app_name}")
+        return None
+
+    def find_async(self, app_name: str, hints: Iterable[str] = (),
+                   on_progress: Optional[Callable[[int, str], None]] = None,
+                   on_done: Optional[Callable[[Optional[str]], None]] = None) -> LocateTask:
+        """
+        在后台线程中查找应用程序
+
+        回调在后台线程中执行，GUI 需要自行通过 after() 切回 Tk 线程。
+
+        Returns:
+            LocateTask: 可用于取消或等待的任务句柄
+        """
+        task = LocateTask()
+        hints = list(hints)
+
+        def run():
+            try:
+                with timed('app_discovery'):
+                    task.result = self.find(app_name, hints, task.cancel_event, on_progress)
+            except Exception as e:
+                self.logger.error(f"搜索应用程序时发生错误: {str(e)}")
+            finally:
+                task.done_event.set()
+                if on_done and not task.cancelled:
+                    on_done(task.result)
+
+        task.thread = threading.Thread(target=run, name='AppLocator', daemon=True)
+        task.thread.start()
+        return task
+
+    def _hint_paths(self, app_name: str, hints: Iterable[str]) -> List[str]:
+        """生成已知安装位置的候选路径"""
+        candidates = list(hints)
+        stem = os.path.splitext(app_name)[0]
+        dir_names = KNOWN_INSTALL_HINTS.get(app_name.lower(), []) + [stem]
+        for base in self.install_dirs:
+            if base:
+                for dir_name in dir_names:
+                    candidates.append(os.path.join(base, dir_name, app_name))
+        for root in self.drive_roots:
+            for dir_name in dir_names:
+                candidates.append(os.path.join(root, dir_name, app_name))
+        return candidates
+
+    def _search_path_env(self, app_name: str) -> Optional[str]:
+        """在系统 PATH 中查找"""
+        target = app_name.lower()
+        for directory in os.environ.get('PATH', '').split(os.pathsep):
+            if not directory:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if target in entry.name.lower() and entry.is_file():
+                            self.logger.info(f"在PATH中找到应用程序: {entry.path}")
+                            return entry.path
+            except OSError:
+                continue
+        return None
+
+    def _scan_dir(self, directory: str, target: str,
+                  should_stop: Callable[[], bool]) -> Tuple[Optional[str], List[str]]:
+        """扫描单个目录，返回 (匹配的文件, 需要继续遍历的子目录)"""
+        subdirs = []
+        if should_stop():
+            return None, subdirs
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name.lower() not in SKIP_DIRS:
+                                subdirs.append(entry.path)
+                        elif target in entry.name.lower() and entry.is_file():
+                            return entry.path, []
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return None, subdirs
+
+    def _scan_batch(self, pending: List[Tuple[str, int]], target: str,
+                    should_stop: Callable[[], bool]) -> Tuple[Optional[str], int, str, List[Tuple[str, int]]]:
+        """
+        按广度优先连续扫描最多 SCAN_BATCH 个目录
+
+        Args:
+            pending (list): 待扫描的 (目录, 深度)
+
+        Returns:
+            tuple: (匹配的文件, 已扫描目录数, 最后扫描的目录, 未扫描完的 (目录, 深度))
+        """
+        pending = deque(pending)
+        scanned = 0
+        directory = ''
+        while pending and scanned < self.SCAN_BATCH:
+            if should_stop():
+                return None, scanned, directory, []
+            directory, depth = pending.popleft()
+            match, subdirs = self._scan_dir(directory, target, should_stop)
+            scanned += 1
+            if match:
+                return match, scanned, directory, []
+            if depth < self.max_depth:
+                pending.extend((subdir, depth + 1) for subdir in subdirs)
+        return None, scanned, directory, list(pending)
+
+    def _walk(self, app_name: str, roots: Iterable[str], cancel_event: threading.Event,
+              on_progress: Optional[Callable[[int, str], None]] = None) -> Optional[str]:
+        """遍历目录树，找到第一个匹配即停止
+
+        每个任务连续扫描一批目录，扫不完的部分拆分后交给空闲线程；
+        max_workers 为 1 时直接在调用线程中扫描。
+        """
+        target = app_name.lower()
+        roots = [root for root in roots if root and os.path.isdir(root)]
+        if not roots:
+            return None
+        for root in roots:
+            self.logger.debug(f"搜索目录: {root}")
+
+        scanned = 0
+        found = None
+        # 找到结果后通知仍在排队的扫描立即返回
+        stop_event = threading.Event()
+
+        def should_stop():
+            return stop_event.is_set() or cancel_event.is_set()
+
+        def report(count, directory):
+            nonlocal scanned
+            previous = scanned
+            scanned += count
+            if on_progress and scanned // 200 != previous // 200:
+                on_progress(scanned, directory)
+
+        if self.max_workers <= 1:
+            pending = [(root, 0) for root in roots]
+            while pending and not cancel_event.is_set():
+                found, count, directory, pending = self._scan_batch(pending, target, should_stop)
+                report(count, directory)
+                if found:
+                    break
+        else:
+            # 完成的批次通过队列交回，避免每轮 wait() 都遍历全部未完成任务
+            completed = queue.Queue()
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='AppLocatorScan') as pool:
+                outstanding = 0
+
+                def submit(pending):
+                    future = pool.submit(self._scan_batch, pending, target, should_stop)
+                    future.add_done_callback(completed.put)
+
+                for root in roots:
+                    submit([(root, 0)])
+                    outstanding += 1
+
+                while outstanding and not cancel_event.is_set():
+                    future = completed.get()
+                    outstanding -= 1
+                    if future.cancelled():
+                        continue
+                    found, count, directory, pending = future.result()
+                    report(count, directory)
+                    if found:
+                        break
+                    # 剩余目录按空闲线程数拆分
+                    parts = max(1, min(len(pending), self.max_workers - outstanding))
+                    for index in range(parts):
+                        if pending[index::parts]:
+                            submit(pending[index::parts])
+                            outstanding += 1
+
+                # 找到结果或被取消时，放弃剩余的扫描
+                stop_event.set()
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        if on_progress:
+            on_progress(scanned, '')
+        return found
@@ -0,0 +1,303 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import psutil
+
+from log_service import log_event
+
+
+class IdlePolicy:
+    """空闲检测策略：进程 CPU 和 IO 增量持续低于阈值超过 idle_seconds 秒即视为空闲"""
+
+    def __init__(self, idle_seconds: float, cpu_seconds_threshold: float = 0.5,
+                 io_bytes_threshold: int = 256 * 1024, sample_interval: float = 30.0):
+        """
+        Args:
+            idle_seconds (float): 持续空闲多久后关闭（秒）
+            cpu_seconds_threshold (float): 每个采样周期内 CPU 时间增量低于该值视为空闲
+            io_bytes_threshold (int): 每个采样周期内 IO 字节增量低于该值视为空闲
+            sample_interval (float): 采样间隔（秒）
+        """
+        self.idle_seconds = idle_seconds
+        self.cpu_seconds_threshold = cpu_seconds_threshold
+        self.io_bytes_threshold = io_bytes_threshold
+        self.sample_interval = sample_interval
+
+
+def sample_usage(pids: Iterable[int]) -> Optional[Tuple[float, int]]:
+    """
+    采样进程累计的 CPU 时间和 IO 字节数
+
+    Returns:
+        Optional[Tuple[float, int]]: (CPU 秒数, IO 字节数)，进程都已退出时返回 None
+    """
+    cpu = 0.0
+    io = 0
+    alive = False
+    for pid in pids:
+        try:
+            proc = psutil.Process(pid)
+            times = proc.cpu_times()
+            cpu += times.user + times.system
+            try:
+                counters = proc.io_counters()
+                io += counters.read_bytes + counters.write_bytes
+            except (psutil.AccessDenied, AttributeError):
+                pass
+            alive = True
+        except psutil.Error:
+            continue
+    return (cpu, io) if alive else None
+
+
+class _Session:
+    """一次应用会话的定时关闭状态"""
+
+    def __init__(self, session_id, started_at, deadline, on_close, pids, idle_policy):
+        self.session_id = session_id
+        self.started_at = started_at
+        self.deadline = deadline
+        self.on_close = on_close
+        self.pids = list(pids)
+        self.idle_policy = idle_policy
+        self.version = 0
+        self.last_sample = None
+        self.idle_since = None
+
+
+class AutoCloseScheduler:
+    """集中式定时关闭调度器
+
+    所有会话共用一个后台线程，按截止时间保存在最小堆中。取消或改期只更新会话
+    版本号，堆中的旧条目在弹出时被丢弃，因此线程数与启动次数无关。
+    """
+
+    # 堆条目类型
+    _DEADLINE = 'deadline'
+    _SAMPLE = 'sample'
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic,
+                 sampler: Callable[[Iterable[int]], Optional[Tuple[float, int]]] = sample_usage):
+        """
+        初始化调度器
+
+        Args:
+            clock (callable): 单调时钟，测试时可替换为假时钟
+            sampler (callable): 进程资源采样函数
+        """
+        self.clock = clock
+        self.sampler = sampler
+        self.logger = logging.getLogger('AppController')
+        self._sessions: Dict[int, _Session] = {}
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # 线程控制
+    # ------------------------------------------------------------------
+    def start(self):
+        """启动调度线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='AutoCloseScheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """停止调度线程"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # 会话管理
+    # ------------------------------------------------------------------
+    def schedule(self, delay: Optional[float], on_close: Callable[[], None],
+                 pids: Iterable[int] = (), idle_policy: Optional[IdlePolicy] = None) -> int:
+        """
+        登记一个会话
+
+        Args:
+            delay (float, optional): 多少秒后关闭，None 表示不定时关闭（仅空闲检测）
+            on_close (callable): 到期或空闲时调用的关闭函数（在调度线程中执行）
+            pids (Iterable[int]): 会话对应的进程，用于空闲检测
+            idle_policy (IdlePolicy, optional): 空闲检测策略
+
+        Returns:
+            int: 会话 ID
+        """
+        with self._condition:
+            now = self.clock()
+            session_id = next(self._ids)
+            deadline = now + delay if delay is not None else None
+            session = _Session(session_id, now, deadline, on_close, pids, idle_policy)
+            self._sessions[session_id] = session
+            self._push_entries(session, now)
+            self._condition.notify()
+        return session_id
+
+    def cancel(self, session_id: int) -> bool:
+        """取消会话，返回会话是否存在"""
+        with self._condition:
+            return self._sessions.pop(session_id, None) is not None
+
+    def cancel_all(self):
+        """取消全部会话"""
+        with self._condition:
+            self._sessions.clear()
+            self._heap.clear()
+
+    def reschedule(self, session_id: int, delay: Optional[float], from_start: bool = False) -> bool:
+        """
+        修改会话的关闭时间
+
+        Args:
+            session_id (int): 会话 ID
+            delay (float, optional): 新的延迟（秒），None 表示取消定时关闭
+            from_start (bool): True 时从会话开始时间计算，否则从现在计算
+
+        Returns:
+            bool: 会话是否存在
+        """
+        with self._condition:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return False
+            now = self.clock()
+            if delay is None:
+                session.deadline = None
+            else:
+                session.deadline = (session.started_at if from_start else now) + delay
+            session.version += 1
+            self._push_entries(session, now)
+            self._condition.notify()
+            return True
+
+    def reschedule_all(self, delay: Optional[float]):
+        """按新的时长（从各会话开始时间计算）调整所有会话，用于管理员修改定时关闭时间"""
+        with self._condition:
+            session_ids = list(self._sessions)
+        for session_id in session_ids:
+            self.reschedule(session_id, delay, from_start=True)
+
+    def active_sessions(self) -> int:
+        """返回未结束的会话数"""
+        with self._condition:
+            return len(self._sessions)
+
+    def deadline_of(self, session_id: int) -> Optional[float]:
+        """返回会话的关闭时间（调度器时钟）"""
+        with self._condition:
+            session = self._sessions.get(session_id)
+            return session.deadline if session else None
+
+    # ------------------------------------------------------------------
+    # 调度
+    # ------------------------------------------------------------------
+    def _push_entries(self, session: _Session, now: float):
+        """将会话的下一次截止和采样时间压入堆（调用方持有锁）"""
+        if session.deadline is not None:
+            heapq.heappush(self._heap, (session.deadline, session.session_id, session.version, self._DEADLINE))
+        if session.idle_policy is not None:
+            heapq.heappush(
+                self._heap,
+                (now + session.idle_policy.sample_interval, session.session_id, session.version, self._SAMPLE)
+            )
+
+    def run_pending(self) -> Optional[float]:
+        """
+        处理所有已到期的条目
+
+        Returns:
+            Optional[float]: 下一个条目的时间，没有条目时返回 None
+        """
+        while True:
+            with self._condition:
+                now = self.clock()
+                # 丢弃已取消或已改期的旧条目
+                while self._heap:
+                    _, session_id, version, _ = self._heap[0]
+                    session = self._sessions.get(session_id)
+                    if session is not None and session.version == version:
+                        break
+                    heapq.heappop(self._heap)
+                if not self._heap or self._heap[0][0] > now:
+                    return self._heap[0][0] if self._heap else None
+
+                _, session_id, _, kind = heapq.heappop(self._heap)
+                session = self._sessions[session_id]
+                if kind == self._DEADLINE:
+                    reason = 'deadline'
+                else:
+                    reason = self._sample(session, now)
+                    if reason is None:
+                        heapq.heappush(
+                            self._heap,
+                            (now + session.idle_policy.sample_interval, session_id, session.version, self._SAMPLE)
+                        )
+                        continue
+                del self._sessions[session_id]
+
+            # 在锁外执行关闭，避免回调中再次调用调度器时死锁
+            self._close(session, reason)
+
+    def _sample(self, session: _Session, now: float) -> Optional[str]:
+        """采样会话进程，返回需要关闭的原因或 None"""
+        policy = session.idle_policy
+        usage = self.sampler(session.pids)
+        if usage is None:
+            # 进程已经退出，结束会话但无需关闭
+            return 'exited'
+
+        previous, session.last_sample = session.last_sample, usage
+        if previous is None:
+            return None
+        cpu_delta = usage[0] - previous[0]
+        io_delta = usage[1] - previous[1]
+        if cpu_delta < policy.cpu_seconds_threshold and io_delta < policy.io_bytes_threshold:
+            if session.idle_since is None:
+                session.idle_since = now - policy.sample_interval
+            if now - session.idle_since >= policy.idle_seconds:
+                return 'idle'
+        else:
+            session.idle_since = None
+        return None
+
+    def _close(self, session: _Session, reason: str):
+        """执行会话的关闭回调"""
+        if reason == 'exited':
+            return
+        log_event('auto_close', session_id=session.session_id, reason=reason)
+        if reason == 'idle':
+            self.logger.info(f"应用程序空闲超过 {session.idle_policy.idle_seconds / 60:g} 分钟，自动关闭")
+        try:
+            session.on_close()
+        except Exception as e:
+            self.logger.error(f"自动关闭应用程序失败: {str(e)}")
+
+    def _run(self):
+        """调度线程主循环"""
+        while True:
+            self.run_pending()
+            with self._condition:
+                if self._stopped:
+                    break
+                # 在锁内读取堆顶，避免错过 run_pending 之后新登记的会话
+                next_time = self._heap[0][0] if self._heap else None
+                if next_time is not None and next_time <= self.clock():
+                    continue
+                timeout = None if next_time is None else next_time - self.clock()
+                # 新会话或改期会通过 notify 提前唤醒
+                self._condition.wait(timeout)
+                if self._stopped:
+                    break
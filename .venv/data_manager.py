@@ -0,0 +1,141 @@
+import logging
+import os
+import time
+from datetime import datetime
+from record_store import RecordStore
+from log_service import log_event, setup_logging, timed
+from usage_analytics import UsageAnalytics
+from notification_service import NotificationDispatcher, NotificationQueue, load_smtp_config
+
+class DataManager:
+    def __init__(self, base_dir='.venv'):
+        """初始化数据管理器"""
+        # 设置基础目录
+        self.base_dir = base_dir
+        self.data_dir = os.path.join(base_dir, 'data')
+        self.log_dir = os.path.join(base_dir, 'logs')
+        
+        # 确保必要的目录存在
+        self._ensure_directories()
+        
+        # 设置日志文件路径
+        self.log_file = os.path.join(self.log_dir, 'printer_assistant.log')
+        self.data_file = os.path.join(self.data_dir, 'print_records.db')
+        # 旧版CSV记录文件，仅用于一次性导入
+        self.legacy_csv_file = os.path.join(self.data_dir, 'print_records.csv')
+        
+        # 初始化日志系统
+        self._setup_logging()
+        
+        # 打开记录存储并导入旧版CSV数据
+        self.store = RecordStore(self.data_file)
+        self._import_legacy_csv()
+        
+        # 使用统计（只处理上次检查点之后的新记录）
+        self.analytics = UsageAnalytics(self.data_file)
+        self._update_analytics()
+        
+        # 打印完成邮件通知队列（发送线程由 start_notifications 启动）
+        self.notifications = NotificationQueue(self.data_file)
+        self.notification_dispatcher = None
+    
+    def _ensure_directories(self):
+        """确保所需的目录结构存在"""
+        for dir_path in [self.data_dir, self.log_dir]:
+            if not os.path.exists(dir_path):
+                os.makedirs(dir_path)
+                logging.info(f"创建目录: {dir_path}")
+    
+    def _setup_logging(self):
+        """配置日志系统（异步写入，文件按大小轮转）"""
+        setup_logging(self.log_dir)
+    
+    def _import_legacy_csv(self):
+        """将旧版CSV记录（包括旧版终端之后追加的行）导入记录存储"""
+        try:
+            self.store.import_csv(self.legacy_csv_file)
+        except Exception as e:
+            logging.error(f"导入旧版记录失败: {str(e)}")
+    
+    def _update_analytics(self):
+        """将新记录计入使用统计，失败不影响登记"""
+        try:
+            self.analytics.catch_up()
+        except Exception as e:
+            logging.error(f"更新使用统计失败: {str(e)}")
+    
+    @timed('save_print_record')
+    def save_print_record(self, user_name, project_name, email, status="开始打印"):
+        """保存打印记录（email 参数为学号，沿用旧参数名）"""
+        try:
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self.store.append(timestamp, user_name, project_name, email, status)
+            self._update_analytics()
+            
+            logging.info(f"保存打印记录 - 用户: {user_name}, 项目: {project_name}")
+            log_event('registration', user_name=user_name, project_name=project_name,
+                      student_id=email, status=status)
+            return True
+        except Exception as e:
+            logging.error(f"保存记录失败: {str(e)}")
+            return False
+    
+    @timed('get_user_history')
+    def get_user_history(self, email=None, user_name=None):
+        """获取用户的打印历史记录（按学号和/或姓名索引查询）"""
+        try:
+            return self.store.history(student_id=email, user_name=user_name)
+        except Exception as e:
+            logging.error(f"读取历史记录失败: {str(e)}")
+            return []
+    
+    @timed('get_recent_records')
+    def get_recent_records(self, limit=10):
+        """获取最近的打印记录"""
+        try:
+            return self.store.recent(limit)
+        except Exception as e:
+            logging.error(f"读取最近记录失败: {str(e)}")
+            return []
+    
+    def start_notifications(self, config_file='admin_config.json'):
+        """根据管理员配置中的 SMTP 设置启动邮件发送线程"""
+        smtp_config = load_smtp_config(config_file)
+        if not smtp_config:
+            logging.info("未配置邮件服务器，打印完成通知将保留在队列中")
+            return False
+        
+        if self.notification_dispatcher is None:
+            self.notification_dispatcher = NotificationDispatcher(
+                self.notifications,
+                smtp_config,
+                dead_letter_file=os.path.join(self.data_dir, 'notifications_dead.jsonl')
+            )
+            self.notification_dispatcher.start()
+        return True
+    
+    def schedule_print_notification(self, user_name, project_name, student_id, email, hours):
+        """登记打印完成邮件通知，hours 小时后发送"""
+        try:
+            due_at = time.time() + float(hours) * 3600
+            job_id = self.notifications.enqueue(due_at, email, user_name, project_name, student_id)
+            if self.notification_dispatcher:
+                self.notification_dispatcher.notify()
+            
+            logging.info(f"登记邮件通知 - 用户: {user_name}, 项目: {project_name}, {hours} 小时后发送")
+            log_event('notification_scheduled', job_id=job_id, user_name=user_name,
+                      project_name=project_name, student_id=student_id, hours=float(hours))
+            return True
+        except Exception as e:
+            logging.error(f"登记邮件通知失败: {str(e)}")
+            return False
+    
+    def update_print_status(self, user_name, project_name, email, new_status):
+        """更新打印状态"""
+        try:
+            self.save_print_record(user_name, project_name, email, new_status)
+            logging.info(f"更新打印状态 - 用户: {user_name}, 项目: {project_name}, 状态: {new_status}")
+            return True
+        except Exception as e:
+            logging.error(f"更新状态失败: {str(e)}")
+            return False 
\ No newline at end of file
@@ -0,0 +1,221 @@
+import atexit
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+
+# 结构化事件使用的日志记录器名称
+EVENT_LOGGER_NAME = 'printer_assistant.events'
+
+# 人类可读日志的单个文件大小上限和保留份数
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+
+# 事件日志按天轮转，保留天数
+EVENT_BACKUP_DAYS = 30
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class _NameFilter(logging.Filter):
+    """按日志记录器名称筛选记录"""
+
+    def __init__(self, names, include=True):
+        super().__init__()
+        self.names = set(names)
+        self.include = include
+
+    def filter(self, record):
+        return (record.name in self.names) == self.include
+
+
+class JsonFormatter(logging.Formatter):
+    """将事件记录格式化为一行 JSON"""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'event': getattr(record, 'event', record.getMessage()),
+        }
+        payload.update(getattr(record, 'fields', {}))
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def setup_logging(log_dir: str = '.venv/logs'):
+    """
+    配置异步日志管道（重复调用时只生效一次）
+
+    调用线程只把记录放入队列，由 QueueListener 线程写入：
+    printer_assistant.log（全部日志）、app_controller.log（AppController 日志）、
+    events.jsonl（结构化事件）以及控制台。
+
+    Args:
+        log_dir (str): 日志目录
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        os.makedirs(log_dir, exist_ok=True)
+        formatter = logging.Formatter(LOG_FORMAT)
+        not_events = _NameFilter([EVENT_LOGGER_NAME], include=False)
+
+        main_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, 'printer_assistant.log'),
+            maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+        main_handler.setFormatter(formatter)
+        main_handler.addFilter(not_events)
+
+        controller_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, 'app_controller.log'),
+            maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding='utf-8'
+        )
+        controller_handler.setFormatter(formatter)
+        controller_handler.addFilter(_NameFilter(['AppController']))
+
+        event_handler = logging.handlers.TimedRotatingFileHandler(
+            os.path.join(log_dir, 'events.jsonl'),
+            when='midnight', backupCount=EVENT_BACKUP_DAYS, encoding='utf-8'
+        )
+        event_handler.setFormatter(JsonFormatter())
+        event_handler.addFilter(_NameFilter([EVENT_LOGGER_NAME]))
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        console_handler.addFilter(not_events)
+
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        root.addHandler(queue_handler)
+
+        # 事件不经过根记录器，避免混入人类可读日志的格式化
+        event_logger = logging.getLogger(EVENT_LOGGER_NAME)
+        event_logger.setLevel(logging.INFO)
+        event_logger.propagate = False
+        event_logger.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(
+            log_queue, main_handler, controller_handler, event_handler, console_handler,
+            respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """停止后台写入线程并刷新队列中剩余的日志"""
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def log_event(event: str, **fields):
+    """
+    写入一条结构化事件（events.jsonl）
+
+    Args:
+        event (str): 事件名称，例如 'registration'、'app_started'
+        **fields: 事件附带的字段
+    """
+    logging.getLogger(EVENT_LOGGER_NAME).info(event, extra={'event': event, 'fields': fields})
+
+
+class LatencyTracker:
+    """保存各热点路径最近若干次耗时，计算滚动分位数"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        """记录一次耗时"""
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        返回各路径的统计
+
+        Returns:
+            dict: {名称: {'count': 样本数, 'p50_ms': 中位数, 'p95_ms': 95分位, 'max_ms': 最大值}}
+        """
+        with self._lock:
+            snapshot = {name: sorted(samples) for name, samples in self._samples.items()}
+        result = {}
+        for name, values in sorted(snapshot.items()):
+            if not values:
+                continue
+            result[name] = {
+                'count': len(values),
+                'p50_ms': values[int(0.5 * (len(values) - 1))] * 1000,
+                'p95_ms': values[int(0.95 * (len(values) - 1))] * 1000,
+                'max_ms': values[-1] * 1000,
+            }
+        return result
+
+    def reset(self):
+        """清空全部样本"""
+        with self._lock:
+            self._samples.clear()
+
+
+latency = LatencyTracker()
+
+
+class timed:
+    """
+    计时工具，可作为装饰器或上下文管理器使用，耗时记入全局 latency
+
+    用法：
+        @timed('save_print_record')
+        def save_print_record(...): ...
+
+        with timed('load_records'):
+            ...
+    """
+
+    def __init__(self, name: str, tracker: Optional[LatencyTracker] = None):
+        self.name = name
+        self.tracker = tracker or latency
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.tracker.record(self.name, time.perf_counter() - self._start)
+        return False
+
+    def __call__(self, func):
+        name = self.name
+        tracker = self.tracker
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracker.record(name, time.perf_counter() - start)
+        return wrapper
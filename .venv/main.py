@@ -0,0 +1,41 @@
+# 全局常量定义
+WINDOW_WIDTH = 1280
+WINDOW_HEIGHT = 720
+
+def create_services():
+    """创建应用控制器和管理员窗口（在第一帧显示之后调用，模块按需导入）"""
+    from app_controller import AppController
+    from admin_window import AdminWindow
+    
+    # 创建应用控制器
+    app_controller = AppController(
+        app_name="bambu-studio.exe",
+        app_path="D:/Bambu Studio/bambu-studio.exe"
+    )
+    
+    # 创建管理员窗口实例，并传入应用控制器
+    admin_window = AdminWindow(app_controller)
+    
+    return app_controller, admin_window
+
+def create_app():
+    """创建GUI并安排后台初始化，返回GUI实例"""
+    from gui import PrinterAssistantGUI
+    
+    # 先创建并显示窗口，非界面相关的初始化推迟到第一帧之后
+    app = PrinterAssistantGUI(
+        window_width=WINDOW_WIDTH,
+        window_height=WINDOW_HEIGHT,
+        defer_services=True
+    )
+    app.schedule_services(create_services)
+    return app
+
+def main():
+    app = create_app()
+    
+    # 运行程序
+    app.run()
+
+if __name__ == '__main__':
+    main()
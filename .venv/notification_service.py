@@ -0,0 +1,382 @@
+import json
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import EmailMessage
+from typing import Callable, Dict, List, Optional
+
+from log_service import log_event, timed
+
+
+class NotificationQueue:
+    """持久化的邮件通知队列
+
+    任务保存在记录库的 notifications 表中，程序重启后继续发送。多个终端共享
+    数据库时，通过 BEGIN IMMEDIATE 事务认领任务，同一任务只会被一个终端发送。
+    """
+
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    DEAD = 'dead'
+
+    # 认领后超过该时间（秒）仍未完成的任务视为中断，重新放回队列
+    CLAIM_TIMEOUT = 600
+
+    def __init__(self, db_path: str, clock: Callable[[], float] = time.time):
+        """
+        初始化通知队列
+
+        Args:
+            db_path (str): 数据库路径（与 RecordStore 相同）
+            clock (callable): 时钟，测试时可替换
+        """
+        self.db_path = db_path
+        self.clock = clock
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA busy_timeout=10000')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """创建通知表"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS notifications ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' due_at REAL NOT NULL,'
+                ' next_attempt_at REAL NOT NULL,'
+                ' recipient TEXT NOT NULL,'
+                ' user_name TEXT NOT NULL,'
+                ' project_name TEXT NOT NULL,'
+                ' student_id TEXT NOT NULL,'
+                ' created_at REAL NOT NULL,'
+                ' attempts INTEGER NOT NULL DEFAULT 0,'
+                ' status TEXT NOT NULL,'
+                ' claimed_at REAL,'
+                ' last_error TEXT)'
+            )
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_notifications_pending'
+                ' ON notifications(status, next_attempt_at)'
+            )
+
+    def close(self):
+        """关闭当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def enqueue(self, due_at: float, recipient: str, user_name: str,
+                project_name: str, student_id: str) -> int:
+        """
+        添加通知任务
+
+        Args:
+            due_at (float): 预计打印完成时间（时间戳）
+            recipient (str): 收件邮箱
+            user_name (str): 使用者姓名
+            project_name (str): 项目名称
+            student_id (str): 学号
+
+        Returns:
+            int: 任务 ID
+        """
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                'INSERT INTO notifications (due_at, next_attempt_at, recipient, user_name,'
+                ' project_name, student_id, created_at, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (due_at, due_at, recipient, user_name, project_name, student_id, self.clock(), self.PENDING)
+            )
+        return cursor.lastrowid
+
+    def next_due(self) -> Optional[float]:
+        """返回最早待发送任务的时间，没有任务时返回 None"""
+        row = self._connect().execute(
+            'SELECT MIN(next_attempt_at) FROM notifications WHERE status = ?', (self.PENDING,)
+        ).fetchone()
+        return row[0]
+
+    def claim(self, until: float, limit: int = 500) -> List[Dict]:
+        """
+        认领 next_attempt_at 不晚于 until 的首次发送任务，以及已经到期的重试任务
+
+        重试任务不参与提前合并，否则退避时间不超过 until - 当前时间的重试
+        会在同一轮中被立即再次认领。
+
+        Returns:
+            List[Dict]: 认领到的任务
+        """
+        now = self.clock()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # 回收中断的认领
+            conn.execute(
+                'UPDATE notifications SET status = ?, claimed_at = NULL WHERE status = ? AND claimed_at < ?',
+                (self.PENDING, self.SENDING, now - self.CLAIM_TIMEOUT)
+            )
+            rows = conn.execute(
+                'SELECT * FROM notifications WHERE status = ?'
+                ' AND (next_attempt_at <= ? OR (attempts = 0 AND next_attempt_at <= ?))'
+                ' ORDER BY next_attempt_at LIMIT ?',
+                (self.PENDING, now, until, limit)
+            ).fetchall()
+            conn.executemany(
+                'UPDATE notifications SET status = ?, claimed_at = ? WHERE id = ?',
+                [(self.SENDING, now, row['id']) for row in rows]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, job_ids: List[int]):
+        """标记任务已发送"""
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                'UPDATE notifications SET status = ?, attempts = attempts + 1, claimed_at = NULL,'
+                ' last_error = NULL WHERE id = ?',
+                [(self.SENT, job_id) for job_id in job_ids]
+            )
+
+    def mark_failed(self, job: Dict, error: str, next_attempt_at: Optional[float]):
+        """
+        记录发送失败
+
+        Args:
+            job (dict): 任务
+            error (str): 错误信息
+            next_attempt_at (float, optional): 下次重试时间，None 表示放弃（进入死信）
+        """
+        status = self.PENDING if next_attempt_at is not None else self.DEAD
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'UPDATE notifications SET status = ?, attempts = attempts + 1, claimed_at = NULL,'
+                ' next_attempt_at = ?, last_error = ? WHERE id = ?',
+                (status, next_attempt_at if next_attempt_at is not None else job['next_attempt_at'],
+                 error, job['id'])
+            )
+
+    def counts(self) -> Dict[str, int]:
+        """返回各状态的任务数"""
+        rows = self._connect().execute(
+            'SELECT status, COUNT(*) FROM notifications GROUP BY status'
+        ).fetchall()
+        return {status: count for status, count in rows}
+
+
+def load_smtp_config(config_file: str = 'admin_config.json') -> Optional[Dict]:
+    """
+    从管理员配置文件读取 SMTP 配置（'smtp' 字段）
+
+    配置示例：
+        {"smtp": {"host": "smtp.example.com", "port": 465, "use_ssl": true,
+                  "username": "...", "password": "...", "sender": "..."}}
+
+    Returns:
+        Optional[Dict]: 未配置时返回 None
+    """
+    try:
+        if os.path.exists(config_file):
+            with open(config_file, 'r') as f:
+                config = json.load(f).get('smtp')
+                if config and config.get('host'):
+                    return config
+    except Exception as e:
+        logging.error(f"读取邮件配置失败: {str(e)}")
+    return None
+
+
+class NotificationDispatcher:
+    """邮件通知发送线程
+
+    单个线程睡眠到下一个任务的到期时间，醒来后把 batch_window 秒内到期的任务
+    合并为一批，通过同一个 SMTP 连接发送。失败的任务按指数退避重试，超过
+    max_attempts 次后写入死信文件。
+    """
+
+    # 没有收到唤醒时，最长多久检查一次数据库（其他终端也可能添加任务）
+    MAX_SLEEP = 60.0
+
+    def __init__(self, queue: NotificationQueue, smtp_config: Dict,
+                 batch_window: float = 60.0, max_attempts: int = 5,
+                 base_backoff: float = 60.0, dead_letter_file: str = '.venv/data/notifications_dead.jsonl',
+                 smtp_factory: Optional[Callable[[Dict], smtplib.SMTP]] = None):
+        """
+        初始化发送线程
+
+        Args:
+            queue (NotificationQueue): 通知队列
+            smtp_config (dict): SMTP 配置，见 load_smtp_config
+            batch_window (float): 合并发送的时间窗口（秒）
+            max_attempts (int): 最多尝试次数
+            base_backoff (float): 第一次重试的等待时间（秒），之后每次翻倍
+            dead_letter_file (str): 死信文件路径（JSON Lines）
+            smtp_factory (callable, optional): 创建 SMTP 连接的函数，默认按配置创建
+        """
+        self.queue = queue
+        self.smtp_config = smtp_config
+        self.batch_window = batch_window
+        self.max_attempts = max_attempts
+        self.base_backoff = base_backoff
+        self.dead_letter_file = dead_letter_file
+        self.smtp_factory = smtp_factory or self._connect_smtp
+        self.logger = logging.getLogger(__name__)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """启动发送线程"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='NotificationDispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """停止发送线程"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def notify(self):
+        """有新任务时唤醒发送线程"""
+        self._wake.set()
+
+    def _run(self):
+        """发送线程主循环"""
+        try:
+            while not self._stopped.is_set():
+                try:
+                    self.dispatch_due()
+                    next_due = self.queue.next_due()
+                except Exception as e:
+                    self.logger.error(f"发送邮件通知失败: {str(e)}")
+                    next_due = None
+                timeout = self.MAX_SLEEP
+                if next_due is not None:
+                    timeout = min(timeout, max(0.0, next_due - self.queue.clock()))
+                self._wake.wait(timeout)
+                self._wake.clear()
+        finally:
+            self.queue.close()
+
+    @timed('dispatch_notifications')
+    def dispatch_due(self) -> int:
+        """
+        发送所有到期的任务（首次发送的任务提前合并 batch_window 内将到期的）
+
+        Returns:
+            int: 本次成功发送的数量
+        """
+        sent_total = 0
+        while True:
+            jobs = self.queue.claim(self.queue.clock() + self.batch_window)
+            if not jobs:
+                return sent_total
+            sent_total += self._send_batch(jobs)
+
+    def _send_batch(self, jobs: List[Dict]) -> int:
+        """通过同一个 SMTP 连接发送一批任务"""
+        try:
+            smtp = self.smtp_factory(self.smtp_config)
+        except Exception as e:
+            for job in jobs:
+                self._fail(job, f"连接邮件服务器失败: {str(e)}")
+            return 0
+
+        sent = []
+        try:
+            for job in jobs:
+                try:
+                    smtp.send_message(self._build_message(job))
+                    sent.append(job['id'])
+                except smtplib.SMTPServerDisconnected as e:
+                    # 连接断开，本批剩余任务稍后重试
+                    for remaining in jobs[jobs.index(job):]:
+                        self._fail(remaining, str(e))
+                    break
+                except Exception as e:
+                    self._fail(job, str(e))
+        finally:
+            try:
+                smtp.quit()
+            except Exception:
+                pass
+            self.queue.mark_sent(sent)
+
+        if sent:
+            log_event('notifications_sent', count=len(sent))
+        return len(sent)
+
+    def _fail(self, job: Dict, error: str):
+        """记录失败，按指数退避安排重试或写入死信"""
+        attempts = job['attempts'] + 1
+        if attempts >= self.max_attempts:
+            self.queue.mark_failed(job, error, None)
+            self._write_dead_letter(job, error, attempts)
+            self.logger.error(f"邮件通知多次发送失败，已放弃: {job['recipient']}")
+        else:
+            delay = self.base_backoff * (2 ** (attempts - 1))
+            self.queue.mark_failed(job, error, self.queue.clock() + delay)
+            self.logger.warning(f"邮件通知发送失败，{delay:g} 秒后重试: {error}")
+
+    def _write_dead_letter(self, job: Dict, error: str, attempts: int):
+        """追加一条死信记录"""
+        try:
+            os.makedirs(os.path.dirname(self.dead_letter_file) or '.', exist_ok=True)
+            entry = dict(job, attempts=attempts, last_error=error, failed_at=self.queue.clock())
+            with open(self.dead_letter_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            log_event('notification_dead_letter', job_id=job['id'], recipient=job['recipient'], error=error)
+        except Exception as e:
+            self.logger.error(f"写入死信文件失败: {str(e)}")
+
+    def _build_message(self, job: Dict) -> EmailMessage:
+        """生成通知邮件"""
+        message = EmailMessage()
+        message['Subject'] = '3D打印完成通知'
+        message['From'] = self.smtp_config.get('sender') or self.smtp_config.get('username', '')
+        message['To'] = job['recipient']
+        message.set_content(
+            f"{job['user_name']} 同学你好：\n\n"
+            f"你的项目「{job['project_name']}」预计已经打印完成，请及时到打印机处取件。\n\n"
+            "—— 3D打印机使用登记助手"
+        )
+        return message
+
+    @staticmethod
+    def _connect_smtp(config: Dict) -> smtplib.SMTP:
+        """按配置建立 SMTP 连接"""
+        host = config['host']
+        timeout = config.get('timeout', 30)
+        if config.get('use_ssl'):
+            smtp = smtplib.SMTP_SSL(host, config.get('port', 465), timeout=timeout)
+        else:
+            smtp = smtplib.SMTP(host, config.get('port', 25), timeout=timeout)
+            if config.get('use_tls'):
+                smtp.starttls()
+        if config.get('username'):
+            smtp.login(config['username'], config.get('password', ''))
+        return smtp
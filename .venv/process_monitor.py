@@ -0,0 +1,245 @@
+import logging
+import subprocess
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional
+
+import psutil
+
+
+class ProcessSnapshot(NamedTuple):
+    """某一时刻的进程状态（不可变，可在任意线程中直接读取）"""
+    running: bool
+    pids: FrozenSet[int]
+    started_at: Optional[float]
+
+
+class ProcessMonitor:
+    """按进程名跟踪外部应用的后台监视器
+
+    只在启动时和每隔 full_scan_interval 秒完整枚举一次进程表，其余时间只对
+    已知 PID 检查存活和创建时间。最新状态以不可变快照的形式整体替换，读取方
+    无需加锁；状态变化时向订阅者发送 'started' / 'exited' 事件。
+    """
+
+    STARTED = 'started'
+    EXITED = 'exited'
+
+    def __init__(self, process_name: str, poll_interval: float = 1.0,
+                 full_scan_interval: float = 30.0):
+        """
+        初始化进程监视器
+
+        Args:
+            process_name (str): 要跟踪的进程名称（例如：'bambu-studio.exe'）
+            poll_interval (float): 存活检查间隔（秒）
+            full_scan_interval (float): 完整枚举进程表的间隔（秒）
+        """
+        self.process_name = process_name
+        self.poll_interval = poll_interval
+        self.full_scan_interval = full_scan_interval
+        self.logger = logging.getLogger('AppController')
+
+        self._snapshot = ProcessSnapshot(False, frozenset(), None)
+        # PID -> 进程创建时间，仅由监视线程修改
+        self._pids: Dict[int, float] = {}
+        # PID -> 自己启动的进程句柄
+        self._handles: Dict[int, subprocess.Popen] = {}
+        self._pending_pids = {}
+        self._pending_lock = threading.Lock()
+        self._subscribers: List[Callable[[str, ProcessSnapshot], None]] = []
+        self._wake = threading.Event()
+        self._force_scan = False
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_full_scan = 0.0
+
+    # ------------------------------------------------------------------
+    # 状态读取（无锁）
+    # ------------------------------------------------------------------
+    @property
+    def snapshot(self) -> ProcessSnapshot:
+        return self._snapshot
+
+    @property
+    def is_running(self) -> bool:
+        return self._snapshot.running
+
+    @property
+    def running_pids(self) -> FrozenSet[int]:
+        return self._snapshot.pids
+
+    @property
+    def session_started_at(self) -> Optional[float]:
+        return self._snapshot.started_at
+
+    # ------------------------------------------------------------------
+    # 控制
+    # ------------------------------------------------------------------
+    def start(self):
+        """启动监视线程（先同步完成一次完整扫描，保证快照可用）"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._full_scan()
+        self._thread = threading.Thread(target=self._run, name='ProcessMonitor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """停止监视线程"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def is_alive(self, pid: int) -> bool:
+        """
+        检查快照中的 PID 是否仍是当初记录的进程（可在任意线程中调用）
+
+        快照最多滞后 poll_interval，期间 PID 可能已被其他进程复用；
+        创建时间与记录不一致时返回 False。
+        """
+        created = self._pids.get(pid)
+        return created is not None and self._is_alive(pid, created)
+
+    def track(self, pid: int, handle=None):
+        """
+        登记一个新启动的进程，无需等待下一次完整扫描
+
+        Args:
+            pid (int): 进程 ID
+            handle (subprocess.Popen, optional): 自己启动的进程句柄，提供时用 poll() 判断存活
+        """
+        with self._pending_lock:
+            self._pending_pids[pid] = handle
+        self._wake.set()
+
+    def refresh(self):
+        """请求立即完整扫描一次进程表"""
+        self._force_scan = True
+        self._wake.set()
+
+    def subscribe(self, callback: Callable[[str, ProcessSnapshot], None]):
+        """
+        订阅状态变化事件
+
+        回调在监视线程中执行，参数为 (事件名, 新快照)，GUI 需自行通过 after() 切回 Tk 线程。
+        """
+        self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable[[str, ProcessSnapshot], None]):
+        """取消订阅"""
+        self._subscribers = [cb for cb in self._subscribers if cb is not callback]
+
+    # ------------------------------------------------------------------
+    # 监视线程
+    # ------------------------------------------------------------------
+    def _run(self):
+        """监视线程主循环"""
+        while not self._stopped.is_set():
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            if self._stopped.is_set():
+                break
+            try:
+                self._absorb_pending()
+                due = time.monotonic() - self._last_full_scan >= self.full_scan_interval
+                if due or self._force_scan:
+                    self._force_scan = False
+                    self._full_scan()
+                else:
+                    self._check_alive()
+            except Exception as e:
+                self.logger.error(f"检查应用程序状态失败: {str(e)}")
+
+    def scan(self) -> Dict[int, float]:
+        """
+        同步完整枚举进程表（不修改监视器状态，可在任意线程中调用）
+
+        Returns:
+            Dict[int, float]: 进程名匹配的 PID -> 进程创建时间
+        """
+        pids = {}
+        for proc in psutil.process_iter(['name', 'create_time']):
+            if proc.info['name'] == self.process_name and self._is_alive(proc.pid):
+                pids[proc.pid] = proc.info['create_time']
+        return pids
+
+    def _full_scan(self):
+        """完整枚举进程表"""
+        pids = self.scan()
+        # 自己启动的进程即使进程名不同也继续跟踪
+        for pid, handle in self._handles.items():
+            if pid in self._pids and handle.poll() is None:
+                pids.setdefault(pid, self._pids[pid])
+        self._last_full_scan = time.monotonic()
+        self._pids = pids
+        self._handles = {pid: handle for pid, handle in self._handles.items() if pid in pids}
+        self._publish()
+
+    def _absorb_pending(self):
+        """合并通过 track() 登记的进程"""
+        with self._pending_lock:
+            pending, self._pending_pids = self._pending_pids, {}
+        for pid, handle in pending.items():
+            try:
+                self._pids[pid] = psutil.Process(pid).create_time()
+            except psutil.Error:
+                continue
+            if handle is not None:
+                self._handles[pid] = handle
+
+    def _check_alive(self):
+        """只检查已知 PID 是否仍然存在（比较创建时间，排除被复用的 PID）"""
+        self._pids = {pid: created for pid, created in self._pids.items() if self._is_alive(pid, created)}
+        self._handles = {pid: handle for pid, handle in self._handles.items() if pid in self._pids}
+        self._publish()
+
+    def _is_alive(self, pid: int, created: Optional[float] = None) -> bool:
+        """
+        检查进程是否存活（有句柄时用 poll()，同时回收已退出的子进程）
+
+        Args:
+            pid (int): 进程 ID
+            created (float, optional): 已知的创建时间，提供时 PID 被其他进程复用也视为已退出
+        """
+        handle = self._handles.get(pid)
+        if handle is not None:
+            return handle.poll() is None
+        if created is None:
+            return psutil.pid_exists(pid)
+        try:
+            return psutil.Process(pid).create_time() == created
+        except psutil.Error:
+            return False
+
+    def _publish(self):
+        """生成新快照，状态变化时通知订阅者"""
+        previous = self._snapshot
+        pids = frozenset(self._pids)
+        if pids == previous.pids:
+            return
+        running = bool(pids)
+        if not running:
+            started_at = None
+        elif previous.running:
+            started_at = previous.started_at
+        else:
+            started_at = min(self._pids.values())
+        snapshot = ProcessSnapshot(running, pids, started_at)
+        self._snapshot = snapshot
+
+        event = None
+        if running and not previous.running:
+            event = self.STARTED
+            self.logger.info(f"检测到应用程序启动: {self.process_name} (PID: {sorted(pids)})")
+        elif previous.running and not running:
+            event = self.EXITED
+            self.logger.info(f"检测到应用程序退出: {self.process_name}")
+        if event:
+            for callback in self._subscribers:
+                try:
+                    callback(event, snapshot)
+                except Exception as e:
+                    self.logger.error(f"进程事件回调失败: {str(e)}")
@@ -0,0 +1,416 @@
+import logging
+import queue
+import sqlite3
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from tkinter import ttk
+
+from log_service import timed
+
+
+class RecordQueryWorker:
+    """在后台线程中执行记录查询，结果通过队列交回 Tk 线程"""
+
+    def __init__(self, store):
+        """
+        初始化查询线程
+
+        Args:
+            store (RecordStore): 记录存储
+        """
+        self.store = store
+        # 当前查询代数，筛选或排序变化时递增，旧代数的查询会被丢弃或中止
+        self.generation = 0
+        # 当前需要的数据块，None 表示不限制；不在其中的分页请求会被跳过或中止
+        self.wanted_blocks = None
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name='RecordQueryWorker', daemon=True)
+        self._thread.start()
+
+    def new_generation(self) -> int:
+        """开始新一代查询，正在执行的旧查询会被中止"""
+        self.generation += 1
+        self.wanted_blocks = None
+        return self.generation
+
+    def set_wanted_blocks(self, blocks):
+        """
+        设置当前需要的数据块（滚动时调用）
+
+        Args:
+            blocks (Iterable[int]): 数据块编号
+        """
+        self.wanted_blocks = frozenset(blocks)
+
+    def submit(self, generation: int, kind: str, **params):
+        """
+        提交查询请求
+
+        Args:
+            generation (int): 请求所属的查询代数
+            kind (str): 'count' 或 'page'（分页请求可带 block 参数）
+            **params: 查询参数
+        """
+        self.requests.put((generation, kind, params))
+
+    def stop(self):
+        """停止查询线程"""
+        self._stopped = True
+        self.requests.put(None)
+
+    def _is_stale(self, generation: int, block=None) -> bool:
+        """判断请求是否已过期（代数变化，或数据块已滚出可见区域）"""
+        if self._stopped or generation != self.generation:
+            return True
+        wanted = self.wanted_blocks
+        return block is not None and wanted is not None and block not in wanted
+
+    def _next_batch(self):
+        """
+        取出队列中的全部请求，同一数据块只保留最后一次
+
+        Returns:
+            list: 请求列表；收到停止信号时返回 None
+        """
+        batch = [self.requests.get()]
+        while True:
+            try:
+                batch.append(self.requests.get_nowait())
+            except queue.Empty:
+                break
+        if None in batch:
+            return None
+        latest = {}
+        for request in batch:
+            generation, kind, params = request
+            key = (generation, kind, params.get('block')) if 'block' in params else id(request)
+            latest.pop(key, None)
+            latest[key] = request
+        return list(latest.values())
+
+    def _run(self):
+        """查询线程主循环"""
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    break
+                for generation, kind, params in batch:
+                    block = params.get('block')
+                    if self._is_stale(generation, block):
+                        continue
+
+                    def cancel(generation=generation, block=block):
+                        return self._is_stale(generation, block)
+
+                    try:
+                        if kind == 'count':
+                            with timed('count_records'):
+                                data = self.store.count(params['filters'], cancel=cancel)
+                        else:
+                            with timed('load_records'):
+                                data = self.store.query(
+                                    params['filters'],
+                                    order_by=params['order_by'],
+                                    descending=params['descending'],
+                                    offset=params['offset'],
+                                    limit=params['limit'],
+                                    cancel=cancel
+                                )
+                    except Exception as e:
+                        if isinstance(e, sqlite3.OperationalError) and self._is_stale(generation, block):
+                            continue
+                        logging.error(f"查询记录失败: {str(e)}")
+                        # 通知界面查询失败，以便稍后重试
+                        self.results.put((generation, 'error', params, str(e)))
+                        continue
+                    self.results.put((generation, kind, params, data))
+        finally:
+            self.store.close()
+
+
+class RecordBrowser:
+    """虚拟化、分页加载的使用记录浏览器
+
+    Treeview 中只保留可见窗口内的行，数据按块在后台线程中加载并缓存，
+    滚动条按记录总数换算，因此打开速度与历史记录多少无关。
+    """
+
+    # 表格列及标题
+    COLUMNS = [
+        ('timestamp', '时间', 160),
+        ('user_name', '姓名', 100),
+        ('project_name', '项目', 200),
+        ('student_id', '学号', 100),
+        ('status', '状态', 100),
+    ]
+
+    # 每次从数据库加载的行数
+    BLOCK_SIZE = 200
+
+    # 最多缓存的数据块数
+    MAX_CACHED_BLOCKS = 50
+
+    # 轮询查询结果的间隔（毫秒）
+    POLL_INTERVAL_MS = 30
+
+    # 输入筛选条件后等待多久再查询（毫秒）
+    SEARCH_DELAY_MS = 250
+
+    # 查询失败后等待多久重试（毫秒）
+    RETRY_DELAY_MS = 2000
+
+    def __init__(self, parent, store, visible_rows=15):
+        """
+        创建记录浏览器
+
+        Args:
+            parent: 父容器
+            store (RecordStore): 记录存储
+            visible_rows (int): 表格可见行数
+        """
+        self.store = store
+        self.visible_rows = visible_rows
+        self.worker = RecordQueryWorker(store)
+
+        # 视图状态
+        self.filters = {}
+        self.order_by = 'id'
+        self.descending = True
+        self.total = 0
+        self.offset = 0
+        self.generation = 0
+        self._blocks = OrderedDict()
+        self._pending_blocks = set()
+        self._search_job = None
+        self._poll_job = None
+        self._retry_job = None
+        self._count_failed = False
+
+        self.frame = ttk.Frame(parent)
+        self._create_widgets()
+        self.refresh()
+        self._poll_results()
+
+    def _create_widgets(self):
+        """创建筛选栏和表格"""
+        filter_frame = ttk.Frame(self.frame)
+        filter_frame.pack(fill='x', pady=(0, 5))
+
+        self.filter_entries = {}
+        for key, label, width in [
+            ('student_id', '学号:', 10),
+            ('user_name', '姓名:', 10),
+            ('project_name', '项目:', 12),
+            ('date_from', '起始日期:', 11),
+            ('date_to', '结束日期:', 11),
+        ]:
+            ttk.Label(filter_frame, text=label).pack(side='left', padx=(0, 2))
+            entry = ttk.Entry(filter_frame, width=width)
+            entry.pack(side='left', padx=(0, 8))
+            entry.bind('<KeyRelease>', lambda e: self._schedule_search())
+            self.filter_entries[key] = entry
+
+        self.count_label = ttk.Label(filter_frame, text='')
+        self.count_label.pack(side='right')
+
+        table_frame = ttk.Frame(self.frame)
+        table_frame.pack(fill='both', expand=True)
+
+        self.tree = ttk.Treeview(
+            table_frame,
+            columns=[column for column, _, _ in self.COLUMNS],
+            show='headings',
+            height=self.visible_rows,
+            selectmode='browse'
+        )
+        for column, heading, width in self.COLUMNS:
+            self.tree.heading(column, text=heading, command=lambda c=column: self._toggle_sort(c))
+            self.tree.column(column, width=width, anchor='w')
+        self.tree.pack(side='left', fill='both', expand=True)
+
+        # 预先创建固定数量的行，滚动时只更新内容
+        self._row_ids = [self.tree.insert('', tk.END, values=()) for _ in range(self.visible_rows)]
+
+        self.scrollbar = ttk.Scrollbar(table_frame, orient='vertical', command=self._on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda e: self._scroll_to(self.offset - 3))
+        self.tree.bind('<Button-5>', lambda e: self._scroll_to(self.offset + 3))
+        self.tree.bind('<Prior>', lambda e: self._scroll_to(self.offset - self.visible_rows))
+        self.tree.bind('<Next>', lambda e: self._scroll_to(self.offset + self.visible_rows))
+
+    def pack(self, **kwargs):
+        """放置浏览器"""
+        self.frame.pack(**kwargs)
+
+    def destroy(self):
+        """停止后台查询和轮询"""
+        if self._poll_job:
+            self.frame.after_cancel(self._poll_job)
+            self._poll_job = None
+        if self._search_job:
+            self.frame.after_cancel(self._search_job)
+            self._search_job = None
+        if self._retry_job:
+            self.frame.after_cancel(self._retry_job)
+            self._retry_job = None
+        self.worker.stop()
+
+    def refresh(self):
+        """按当前筛选和排序条件重新加载"""
+        self.generation = self.worker.new_generation()
+        self._blocks.clear()
+        self._pending_blocks.clear()
+        self._count_failed = False
+        self.total = 0
+        self.offset = 0
+        self.count_label.config(text='加载中...')
+        self.worker.submit(self.generation, 'count', filters=dict(self.filters))
+        self._render()
+
+    def _schedule_search(self):
+        """输入变化后延迟查询，连续输入只执行最后一次"""
+        if self._search_job:
+            self.frame.after_cancel(self._search_job)
+        self._search_job = self.frame.after(self.SEARCH_DELAY_MS, self._apply_filters)
+
+    def _apply_filters(self):
+        """读取筛选条件并重新查询"""
+        self._search_job = None
+        filters = {
+            key: entry.get().strip()
+            for key, entry in self.filter_entries.items()
+            if entry.get().strip()
+        }
+        if filters != self.filters:
+            self.filters = filters
+            self.refresh()
+
+    def _toggle_sort(self, column):
+        """点击表头切换排序列和方向"""
+        if self.order_by == column:
+            self.descending = not self.descending
+        else:
+            self.order_by = column
+            self.descending = False
+        for name, heading, _ in self.COLUMNS:
+            arrow = (' ▼' if self.descending else ' ▲') if name == self.order_by else ''
+            self.tree.heading(name, text=heading + arrow)
+        self.refresh()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        """处理滚动条事件"""
+        if action == 'moveto':
+            self._scroll_to(int(float(value) * self.total))
+        elif action == 'scroll':
+            step = self.visible_rows if unit == 'pages' else 1
+            self._scroll_to(self.offset + int(value) * step)
+
+    def _on_mousewheel(self, event):
+        """处理鼠标滚轮事件"""
+        self._scroll_to(self.offset - int(event.delta / 120) * 3)
+        return 'break'
+
+    def _scroll_to(self, offset):
+        """滚动到指定的记录位置"""
+        offset = max(0, min(offset, self.total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+        return 'break'
+
+    def _render(self):
+        """用缓存中的数据刷新可见行，缺失的数据块交给后台加载"""
+        for index, row_id in enumerate(self._row_ids):
+            position = self.offset + index
+            if position >= self.total:
+                self.tree.item(row_id, values=())
+                continue
+            block = self._blocks.get(position // self.BLOCK_SIZE)
+            if block is None:
+                self.tree.item(row_id, values=('...',))
+                continue
+            record = block[position % self.BLOCK_SIZE] if position % self.BLOCK_SIZE < len(block) else None
+            self.tree.item(row_id, values=[record[c] for c, _, _ in self.COLUMNS] if record else ())
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + self.visible_rows) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+        self._request_visible_blocks()
+
+    def _request_visible_blocks(self):
+        """请求可见区域及相邻的数据块，不再需要的数据块请求会被后台跳过或中止"""
+        if not self.total:
+            return
+        first = self.offset // self.BLOCK_SIZE
+        last = (self.offset + self.visible_rows - 1) // self.BLOCK_SIZE
+        last_block = (self.total - 1) // self.BLOCK_SIZE
+        visible = list(range(first, min(last, last_block) + 1))
+        neighbours = [index for index in (first - 1, last + 1) if 0 <= index <= last_block]
+
+        self.worker.set_wanted_blocks(visible + neighbours)
+        self._pending_blocks.intersection_update(visible + neighbours)
+        # 先请求可见的数据块，再预取相邻的
+        for index in visible + neighbours:
+            if index in self._blocks:
+                self._blocks.move_to_end(index)
+            elif index not in self._pending_blocks:
+                self._pending_blocks.add(index)
+                self.worker.submit(
+                    self.generation, 'page',
+                    filters=dict(self.filters),
+                    order_by=self.order_by,
+                    descending=self.descending,
+                    offset=index * self.BLOCK_SIZE,
+                    limit=self.BLOCK_SIZE,
+                    block=index
+                )
+
+    def _retry(self):
+        """重新请求加载失败的查询"""
+        self._retry_job = None
+        if self._count_failed:
+            self.refresh()
+        else:
+            self._request_visible_blocks()
+
+    def _poll_results(self):
+        """在 Tk 线程中取回后台查询结果"""
+        updated = False
+        try:
+            while True:
+                generation, kind, params, data = self.worker.results.get_nowait()
+                if generation != self.generation:
+                    continue
+                if kind == 'error':
+                    # 失败的请求稍后重试：数据块重新请求，总数失败则整体重新加载
+                    if self._retry_job is None:
+                        self._retry_job = self.frame.after(self.RETRY_DELAY_MS, self._retry)
+                    if 'block' in params:
+                        self._pending_blocks.discard(params['block'])
+                    else:
+                        self._count_failed = True
+                        self.count_label.config(text='加载失败')
+                    continue
+                if kind == 'count':
+                    self.total = data
+                    self.count_label.config(text=f'共 {data} 条记录')
+                else:
+                    self._pending_blocks.discard(params['block'])
+                    self._blocks[params['block']] = data
+                    while len(self._blocks) > self.MAX_CACHED_BLOCKS:
+                        self._blocks.popitem(last=False)
+                updated = True
+        except queue.Empty:
+            pass
+
+        if updated:
+            self._render()
+        self._poll_job = self.frame.after(self.POLL_INTERVAL_MS, self._poll_results)
@@ -0,0 +1,313 @@
+import csv
+import io
+import logging
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class RecordStore:
+    """基于 SQLite（WAL 模式）的只追加打印记录存储
+
+    记录按写入顺序追加，不做原地修改；按学号、姓名和时间戳建立持久索引，
+    使最近记录和个人历史查询不再随文件大小线性变慢。多个登记终端共享
+    同一数据目录时，由 SQLite 的文件锁保证写入安全。
+    """
+
+    # 对外暴露的字段顺序（与旧 CSV 文件保持一致）
+    FIELDS = ['timestamp', 'user_name', 'project_name', 'student_id', 'status']
+
+    # 允许排序的列（id 即写入顺序）
+    SORTABLE_COLUMNS = ('id', 'timestamp', 'user_name', 'project_name', 'student_id', 'status')
+
+    # 多个终端同时写入时，等待锁释放的最长时间（毫秒）
+    BUSY_TIMEOUT_MS = 10000
+
+    # 执行多少条虚拟机指令检查一次取消标志
+    CANCEL_CHECK_INTERVAL = 1000
+
+    # meta 表中记录 CSV 已导入字节偏移的键
+    CSV_IMPORT_KEY = 'csv_imported'
+
+    def __init__(self, db_path: str):
+        """
+        初始化记录存储
+
+        Args:
+            db_path (str): SQLite 数据库文件路径
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接（每个线程独立一个连接）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=self.BUSY_TIMEOUT_MS / 1000)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f'PRAGMA busy_timeout={self.BUSY_TIMEOUT_MS}')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """创建表和索引"""
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS records ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' timestamp TEXT NOT NULL,'
+                ' user_name TEXT NOT NULL,'
+                ' project_name TEXT NOT NULL,'
+                ' student_id TEXT NOT NULL,'
+                ' status TEXT NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_records_student_id ON records(student_id, id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_records_user_name ON records(user_name, id)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_records_timestamp ON records(timestamp)')
+            # 每个可排序列都有索引（隐含 id），深处分页不需要对全表排序
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_records_project_name ON records(project_name)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_records_status ON records(status)')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    def close(self):
+        """关闭当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def append(self, timestamp: str, user_name: str, project_name: str,
+               student_id: str, status: str) -> int:
+        """
+        追加一条记录
+
+        Returns:
+            int: 新记录的自增 ID
+        """
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                'INSERT INTO records (timestamp, user_name, project_name, student_id, status)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                (timestamp, user_name, project_name, student_id, status)
+            )
+        return cursor.lastrowid
+
+    def recent(self, limit: int = 10) -> List[Dict[str, str]]:
+        """
+        按写入顺序返回最后 limit 条记录（从自增主键尾部读取）
+
+        Returns:
+            List[Dict[str, str]]: 由旧到新排列的记录
+        """
+        rows = self._connect().execute(
+            'SELECT timestamp, user_name, project_name, student_id, status'
+            ' FROM records ORDER BY id DESC LIMIT ?',
+            (limit,)
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def history(self, student_id: Optional[str] = None,
+                user_name: Optional[str] = None) -> List[Dict[str, str]]:
+        """
+        按学号和/或姓名查询历史记录（走索引），两者都为空时返回全部记录
+
+        Returns:
+            List[Dict[str, str]]: 由旧到新排列的记录
+        """
+        clauses = []
+        params = []
+        if student_id is not None:
+            clauses.append('student_id = ?')
+            params.append(student_id)
+        if user_name is not None:
+            clauses.append('user_name = ?')
+            params.append(user_name)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._connect().execute(
+            'SELECT timestamp, user_name, project_name, student_id, status'
+            f' FROM records{where} ORDER BY id',
+            params
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, filters: Optional[Dict[str, str]] = None,
+              cancel: Optional[Callable[[], bool]] = None) -> int:
+        """
+        返回符合筛选条件的记录数
+
+        Args:
+            filters (dict, optional): 筛选条件，见 _build_where
+            cancel (callable, optional): 返回 True 时中止查询
+
+        Returns:
+            int: 记录数
+        """
+        where, params = self._build_where(filters)
+        rows = self._execute(f'SELECT COUNT(*) FROM records{where}', params, cancel)
+        return rows[0][0]
+
+    def query(self, filters: Optional[Dict[str, str]] = None, order_by: str = 'id',
+              descending: bool = False, offset: int = 0, limit: int = 100,
+              cancel: Optional[Callable[[], bool]] = None) -> List[Dict[str, str]]:
+        """
+        分页查询记录
+
+        Args:
+            filters (dict, optional): 筛选条件，见 _build_where
+            order_by (str): 排序列，必须在 SORTABLE_COLUMNS 中
+            descending (bool): 是否降序
+            offset (int): 跳过的记录数
+            limit (int): 返回的最大记录数
+            cancel (callable, optional): 返回 True 时中止查询
+
+        Returns:
+            List[Dict[str, str]]: 当前页的记录
+
+        Raises:
+            ValueError: 排序列不合法
+            sqlite3.OperationalError: 查询被 cancel 中止
+        """
+        if order_by not in self.SORTABLE_COLUMNS:
+            raise ValueError(f"不支持的排序列: {order_by}")
+        direction = 'DESC' if descending else 'ASC'
+        order = f'{order_by} {direction}' if order_by == 'id' else f'{order_by} {direction}, id {direction}'
+        where, params = self._build_where(filters)
+        rows = self._execute(
+            'SELECT timestamp, user_name, project_name, student_id, status'
+            f' FROM records{where} ORDER BY {order} LIMIT ? OFFSET ?',
+            params + [limit, offset],
+            cancel
+        )
+        return [dict(row) for row in rows]
+
+    def _build_where(self, filters: Optional[Dict[str, str]]) -> Tuple[str, list]:
+        """
+        根据筛选条件生成 WHERE 子句
+
+        支持的键：student_id / user_name（前缀匹配，可走索引）、
+        project_name（包含匹配）、date_from / date_to（YYYY-MM-DD，含当天）。
+        """
+        clauses = []
+        params = []
+        for column in ('student_id', 'user_name'):
+            prefix = (filters or {}).get(column)
+            if prefix:
+                # 用范围比较实现前缀匹配，以便使用索引
+                clauses.append(f'{column} >= ? AND {column} < ?')
+                params.extend([prefix, prefix + '\U0010ffff'])
+        project = (filters or {}).get('project_name')
+        if project:
+            clauses.append("project_name LIKE ? ESCAPE '\\'")
+            escaped = project.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            params.append(f'%{escaped}%')
+        date_from = (filters or {}).get('date_from')
+        if date_from:
+            clauses.append('timestamp >= ?')
+            params.append(date_from)
+        date_to = (filters or {}).get('date_to')
+        if date_to:
+            clauses.append('timestamp <= ?')
+            params.append(date_to + ' 23:59:59')
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where, params
+
+    def _execute(self, sql: str, params: list,
+                 cancel: Optional[Callable[[], bool]] = None) -> List[sqlite3.Row]:
+        """执行只读查询，cancel 返回 True 时由 SQLite 中止执行"""
+        conn = self._connect()
+        if cancel is None:
+            return conn.execute(sql, params).fetchall()
+        conn.set_progress_handler(lambda: 1 if cancel() else 0, self.CANCEL_CHECK_INTERVAL)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.set_progress_handler(None, 0)
+
+    def import_csv(self, csv_path: str) -> int:
+        """
+        将旧版 CSV 记录文件导入数据库
+
+        旧文件的表头可能是 email 也可能是 student_id，两者都按学号导入。
+        数据库与 CSV 位于同一数据目录，用固定的键记录已导入的字节偏移，
+        再次调用时只导入之后追加的完整行（升级期间旧版终端可能仍在追加），
+        已导入部分被修改不会导致重复导入。
+
+        Args:
+            csv_path (str): CSV 文件路径
+
+        Returns:
+            int: 本次导入的记录条数；文件不存在或没有新内容时返回 0
+        """
+        if not os.path.exists(csv_path):
+            return 0
+
+        conn = self._connect()
+        # BEGIN IMMEDIATE 先拿到写锁，多个终端同时启动时依次执行，不会重复导入
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            offset = self._imported_offset(conn, csv_path)
+            with open(csv_path, 'rb') as file:
+                header = file.readline()
+                # 已导入部分被编辑后文件可能变短，此时从文件末尾继续
+                offset = min(max(offset, len(header)), os.fstat(file.fileno()).st_size)
+                file.seek(offset)
+                tail = file.read()
+            # 只导入完整的行，正在写入的最后一行留到下次
+            tail = tail[:tail.rfind(b'\n') + 1]
+            if not tail:
+                # 从旧版标记迁移或文件变短时也记下偏移，之后追加的行才能被导入
+                conn.execute(
+                    'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                    (self.CSV_IMPORT_KEY, str(offset))
+                )
+                conn.commit()
+                return 0
+
+            rows = []
+            reader = csv.DictReader(io.StringIO((header + tail).decode('utf-8'), newline=''))
+            if reader.fieldnames:
+                reader.fieldnames = [name.strip() for name in reader.fieldnames]
+            for row in reader:
+                row = {key: (value or '').strip() for key, value in row.items() if key}
+                if not row.get('timestamp'):
+                    continue
+                rows.append((
+                    row['timestamp'],
+                    row.get('user_name', ''),
+                    row.get('project_name', ''),
+                    row.get('student_id') or row.get('email', ''),
+                    row.get('status', '')
+                ))
+
+            conn.executemany(
+                'INSERT INTO records (timestamp, user_name, project_name, student_id, status)'
+                ' VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+            conn.execute(
+                'INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)',
+                (self.CSV_IMPORT_KEY, str(offset + len(tail)))
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logging.info(f"已从CSV导入 {len(rows)} 条记录: {csv_path}")
+        return len(rows)
+
+    def _imported_offset(self, conn: sqlite3.Connection, csv_path: str) -> int:
+        """返回 CSV 已导入的字节偏移（需在导入事务中调用）"""
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (self.CSV_IMPORT_KEY,)).fetchone()
+        if row:
+            return int(row['value'])
+        # 旧版本按路径或内容标记且不记录偏移：视为当前文件已全部导入
+        if conn.execute("SELECT 1 FROM meta WHERE key LIKE 'csv_imported:%'").fetchone():
+            return os.path.getsize(csv_path)
+        return 0
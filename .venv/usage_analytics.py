@@ -0,0 +1,404 @@
+import csv
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from log_service import timed
+
+
+
+# 汇总维度
+DIM_DAY = 'day'
+DIM_STUDENT = 'student'
+DIM_PROJECT = 'project'
+DIM_HOUR_OF_WEEK = 'hour_of_week'
+DIM_OPEN_SECONDS = 'open_seconds'
+
+WEEKDAY_NAMES = ['周一', '周二', '周三', '周四', '周五', '周六', '周日']
+
+
+# 可以直接按 datetime64[h] 批量解析的时间前缀
+_HOUR_PREFIX = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}$')
+
+
+def _load_numpy():
+    """按需导入 NumPy（可选依赖，仅用于全量重算，不拖慢启动），不可用时返回 None"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _hour_of_week(timestamp: str) -> Optional[str]:
+    """返回 '星期-小时' 键，时间戳无法解析时返回 None"""
+    try:
+        moment = datetime.strptime(timestamp[:13], '%Y-%m-%d %H')
+    except ValueError:
+        return None
+    return f'{moment.weekday()}-{moment.hour:02d}'
+
+
+def _keys_for(timestamp: str, student_id: str, project_name: str) -> List[Tuple[str, str]]:
+    """返回一条记录需要累加的 (维度, 键)"""
+    day = timestamp[:10]
+    keys = [(DIM_DAY, day), (DIM_STUDENT, student_id), (DIM_PROJECT, project_name)]
+    hour_key = _hour_of_week(timestamp)
+    if hour_key is not None:
+        keys.append((DIM_HOUR_OF_WEEK, hour_key))
+    return keys
+
+
+class UsageAnalytics:
+    """增量维护的使用统计
+
+    汇总计数保存在记录库的 rollups 表中，并用 meta 表中的检查点记录已处理到的
+    记录 ID。每次只处理检查点之后新增的记录，汇总和检查点在同一事务中更新，
+    因此重启或多个终端共享数据库时都不会重复计数。
+    """
+
+    CHECKPOINT_KEY = 'analytics_last_id'
+
+    # 待处理的记录达到该数量且不少于全部记录的一半时，改为全量重算
+    REBUILD_THRESHOLD = 10000
+
+    def __init__(self, db_path: str):
+        """
+        初始化统计模块
+
+        Args:
+            db_path (str): 记录库路径（与 RecordStore 相同）
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._session_started_at: Optional[float] = None
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        """获取当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute('PRAGMA busy_timeout=10000')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """创建汇总表"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS rollups ('
+                ' dim TEXT NOT NULL, key TEXT NOT NULL, value REAL NOT NULL,'
+                ' PRIMARY KEY (dim, key)) WITHOUT ROWID'
+            )
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    def close(self):
+        """关闭当前线程的数据库连接"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # 增量更新
+    # ------------------------------------------------------------------
+    @timed('analytics_catch_up')
+    def catch_up(self) -> int:
+        """
+        处理检查点之后新增的记录
+
+        首次启动（检查点为 0）或积压较多时改用 rebuild() 批量重算，
+        避免在界面线程中逐条处理整个历史。
+
+        Returns:
+            int: 本次处理的记录数
+        """
+        conn = self._connect()
+        newest = conn.execute('SELECT MAX(id) FROM records').fetchone()[0] or 0
+        backlog = newest - self._checkpoint(conn)
+        if backlog >= self.REBUILD_THRESHOLD and backlog * 2 >= newest:
+            return self.rebuild()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            last_id = self._checkpoint(conn)
+            rows = conn.execute(
+                'SELECT id, timestamp, student_id, project_name FROM records WHERE id > ? ORDER BY id',
+                (last_id,)
+            ).fetchall()
+            if rows:
+                increments: Dict[Tuple[str, str], float] = {}
+                for _, timestamp, student_id, project_name in rows:
+                    for key in _keys_for(timestamp, student_id, project_name):
+                        increments[key] = increments.get(key, 0) + 1
+                self._apply(conn, increments.items())
+                self._set_checkpoint(conn, rows[-1][0])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(rows)
+
+    def record_open_time(self, started_at: float, ended_at: float):
+        """
+        累加切片软件的打开时长（按会话开始的日期计）
+
+        Args:
+            started_at (float): 会话开始时间（时间戳）
+            ended_at (float): 会话结束时间（时间戳）
+        """
+        seconds = max(0.0, ended_at - started_at)
+        day = datetime.fromtimestamp(started_at).strftime('%Y-%m-%d')
+        conn = self._connect()
+        with conn:
+            self._apply(conn, [((DIM_OPEN_SECONDS, day), seconds)])
+
+    def on_process_event(self, event: str, snapshot):
+        """ProcessMonitor 事件回调：统计切片软件实际打开的时间"""
+        try:
+            if event == 'started':
+                self._session_started_at = snapshot.started_at or time.time()
+            elif event == 'exited' and self._session_started_at:
+                self.record_open_time(self._session_started_at, time.time())
+                self._session_started_at = None
+        except Exception as e:
+            logging.error(f"记录软件使用时长失败: {str(e)}")
+
+    def _checkpoint(self, conn: sqlite3.Connection) -> int:
+        row = conn.execute('SELECT value FROM meta WHERE key = ?', (self.CHECKPOINT_KEY,)).fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_checkpoint(self, conn: sqlite3.Connection, last_id: int):
+        conn.execute(
+            'INSERT INTO meta (key, value) VALUES (?, ?)'
+            ' ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+            (self.CHECKPOINT_KEY, str(last_id))
+        )
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, increments: Iterable[Tuple[Tuple[str, str], float]]):
+        conn.executemany(
+            'INSERT INTO rollups (dim, key, value) VALUES (?, ?, ?)'
+            ' ON CONFLICT(dim, key) DO UPDATE SET value = value + excluded.value',
+            [(dim, key, value) for (dim, key), value in increments]
+        )
+
+    # ------------------------------------------------------------------
+    # 全量重算
+    # ------------------------------------------------------------------
+    @timed('analytics_rebuild')
+    def rebuild(self, use_numpy: bool = True) -> int:
+        """
+        根据全部记录重新计算汇总（保留已累计的打开时长）
+
+        Args:
+            use_numpy (bool): NumPy 可用时使用向量化计数
+
+        Returns:
+            int: 参与计算的记录数
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = conn.execute(
+                'SELECT id, timestamp, student_id, project_name FROM records ORDER BY id'
+            ).fetchall()
+            np = _load_numpy() if use_numpy and rows else None
+            if np is not None:
+                increments = self._count_numpy(np, rows)
+            else:
+                increments = {}
+                for _, timestamp, student_id, project_name in rows:
+                    for key in _keys_for(timestamp, student_id, project_name):
+                        increments[key] = increments.get(key, 0) + 1
+            conn.execute('DELETE FROM rollups WHERE dim != ?', (DIM_OPEN_SECONDS,))
+            self._apply(conn, increments.items())
+            self._set_checkpoint(conn, rows[-1][0] if rows else 0)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return len(rows)
+
+    @staticmethod
+    def _count_numpy(np, rows) -> Dict[Tuple[str, str], float]:
+        """用 NumPy 对各维度做批量计数（结果与逐条计数相同）"""
+        timestamps = [row[1] for row in rows]
+        columns = {
+            DIM_DAY: np.array([ts[:10] for ts in timestamps]),
+            DIM_STUDENT: np.array([row[2] for row in rows]),
+            DIM_PROJECT: np.array([row[3] for row in rows]),
+        }
+        # 格式规范的时间戳批量解析星期和小时，其余的逐条解析（无法解析的跳过）
+        prefixes = [ts[:13] for ts in timestamps]
+        regular = [prefix.replace(' ', 'T') for prefix in prefixes if _HOUR_PREFIX.match(prefix)]
+        irregular = [prefix for prefix in prefixes if not _HOUR_PREFIX.match(prefix)]
+        try:
+            parsed = np.array(regular, dtype='datetime64[h]')
+        except ValueError:
+            # 格式正确但日期不存在（例如 2 月 30 日），全部改为逐条解析
+            parsed = np.array([], dtype='datetime64[h]')
+            irregular = prefixes
+        hour_keys = []
+        if len(parsed):
+            days = parsed.astype('datetime64[D]')
+            # 1970-01-01 是周四，换算为周一 = 0
+            weekdays = (days.astype('int64') + 3) % 7
+            hours = (parsed - days).astype('int64')
+            hour_keys = np.char.add(np.char.add(weekdays.astype(str), '-'),
+                                    np.char.zfill(hours.astype(str), 2)).tolist()
+        hour_keys += [key for key in map(_hour_of_week, irregular) if key is not None]
+        columns[DIM_HOUR_OF_WEEK] = np.array(hour_keys, dtype=str)
+
+        increments = {}
+        for dim, values in columns.items():
+            keys, counts = np.unique(values, return_counts=True)
+            for key, count in zip(keys.tolist(), counts.tolist()):
+                increments[(dim, key)] = float(count)
+        return increments
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+    def rollup(self, dim: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        返回某一维度的汇总，按数值从大到小排列
+
+        Args:
+            dim (str): 维度名称
+            limit (int, optional): 最多返回的条数
+        """
+        sql = 'SELECT key, value FROM rollups WHERE dim = ? ORDER BY value DESC, key'
+        params: list = [dim]
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return [tuple(row) for row in self._connect().execute(sql, params).fetchall()]
+
+    def summary(self, date_from: Optional[str] = None, date_to: Optional[str] = None,
+                top: int = 10) -> Dict[str, object]:
+        """
+        返回日期范围内的统计（不指定范围时直接读取汇总表）
+
+        Args:
+            date_from (str, optional): 起始日期 YYYY-MM-DD
+            date_to (str, optional): 结束日期 YYYY-MM-DD（含当天）
+            top (int): 学生和项目排行的条数
+
+        Returns:
+            dict: 包含 total_sessions、unique_students、repeat_students、open_hours、
+                  by_day、by_hour_of_week、top_students、top_projects
+        """
+        conn = self._connect()
+        day_from = date_from or '0000-00-00'
+        day_to = date_to or '9999-99-99'
+        by_day = conn.execute(
+            'SELECT key, value FROM rollups WHERE dim = ? AND key BETWEEN ? AND ? ORDER BY key',
+            (DIM_DAY, day_from, day_to)
+        ).fetchall()
+        open_seconds = conn.execute(
+            'SELECT COALESCE(SUM(value), 0) FROM rollups WHERE dim = ? AND key BETWEEN ? AND ?',
+            (DIM_OPEN_SECONDS, day_from, day_to)
+        ).fetchone()[0]
+
+        if date_from or date_to:
+            # 有日期范围时按时间戳索引扫描该范围内的记录
+            where = ' WHERE timestamp >= ? AND timestamp <= ?'
+            params = (day_from, day_to + ' 23:59:59')
+            students = conn.execute(
+                f'SELECT student_id, COUNT(*) AS n FROM records{where} GROUP BY student_id ORDER BY n DESC',
+                params
+            ).fetchall()
+            projects = conn.execute(
+                f'SELECT project_name, COUNT(*) AS n FROM records{where}'
+                ' GROUP BY project_name ORDER BY n DESC LIMIT ?',
+                params + (top,)
+            ).fetchall()
+            hour_counts: Dict[str, float] = {}
+            for (timestamp,) in conn.execute(f'SELECT timestamp FROM records{where}', params):
+                for dim, key in _keys_for(timestamp, '', '')[3:]:
+                    hour_counts[key] = hour_counts.get(key, 0) + 1
+            by_hour = sorted(hour_counts.items())
+        else:
+            students = conn.execute(
+                'SELECT key, value FROM rollups WHERE dim = ? ORDER BY value DESC', (DIM_STUDENT,)
+            ).fetchall()
+            projects = self.rollup(DIM_PROJECT, top)
+            by_hour = conn.execute(
+                'SELECT key, value FROM rollups WHERE dim = ? ORDER BY key', (DIM_HOUR_OF_WEEK,)
+            ).fetchall()
+
+        return {
+            'total_sessions': int(sum(value for _, value in by_day)),
+            'unique_students': len(students),
+            'repeat_students': sum(1 for _, value in students if value >= 2),
+            'open_hours': round(open_seconds / 3600, 2),
+            'by_day': [(key, int(value)) for key, value in by_day],
+            'by_hour_of_week': [(key, int(value)) for key, value in by_hour],
+            'top_students': [(key, int(value)) for key, value in students[:top]],
+            'top_projects': [(key, int(value)) for key, value in projects],
+        }
+
+    # ------------------------------------------------------------------
+    # 导出
+    # ------------------------------------------------------------------
+    @timed('analytics_export')
+    def export(self, path: str, date_from: Optional[str] = None, date_to: Optional[str] = None,
+               fmt: str = 'csv') -> int:
+        """
+        导出日期范围内的记录
+
+        CSV 格式逐行写出原始记录；JSON 格式包含 summary 统计和 records 记录列表。
+
+        Args:
+            path (str): 导出文件路径
+            date_from (str, optional): 起始日期 YYYY-MM-DD
+            date_to (str, optional): 结束日期 YYYY-MM-DD（含当天）
+            fmt (str): 'csv' 或 'json'
+
+        Returns:
+            int: 导出的记录数
+        """
+        if fmt not in ('csv', 'json'):
+            raise ValueError(f"不支持的导出格式: {fmt}")
+        params = (date_from or '0000-00-00', (date_to or '9999-99-99') + ' 23:59:59')
+        cursor = self._connect().execute(
+            'SELECT timestamp, user_name, project_name, student_id, status FROM records'
+            ' WHERE timestamp >= ? AND timestamp <= ? ORDER BY timestamp, id',
+            params
+        )
+        fields = ['timestamp', 'user_name', 'project_name', 'student_id', 'status']
+        count = 0
+        if fmt == 'csv':
+            with open(path, 'w', newline='', encoding='utf-8-sig') as file:
+                writer = csv.writer(file)
+                writer.writerow(fields)
+                while True:
+                    rows = cursor.fetchmany(5000)
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    count += len(rows)
+        else:
+            # 记录逐批写出，不在内存中构建完整列表
+            summary = self.summary(date_from, date_to)
+            with open(path, 'w', encoding='utf-8') as file:
+                header = json.dumps({'date_from': date_from, 'date_to': date_to, 'summary': summary},
+                                    ensure_ascii=False)
+                file.write(header[:-1] + ', "records": [')
+                while True:
+                    rows = cursor.fetchmany(5000)
+                    if not rows:
+                        break
+                    file.write((', ' if count else '') +
+                               ', '.join(json.dumps(dict(zip(fields, row)), ensure_ascii=False) for row in rows))
+                    count += len(rows)
+                file.write(']}')
+        logging.info(f"导出使用记录 {count} 条: {path}")
+        return count
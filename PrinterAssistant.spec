@@ -5,7 +5,7 @@ a = Analysis(
     ['.venv\\main.py'],
     pathex=[],
     binaries=[],
-    datas=[('.venv/data/print_records.csv', '.venv/data'), ('admin_config.json', '.'), ('.venv/logs', 'logs'), ('.venv/data_manager.py', '.'), ('.venv/printer_control.py', '.'), ('.venv/admin_window.py', '.'), ('.venv/gui.py', '.'), ('.venv/app_controller.py', '.')],
+    datas=[('.venv/data/print_records.csv', '.venv/data'), ('admin_config.json', '.'), ('.venv/logs', 'logs'), ('.venv/data_manager.py', '.'), ('.venv/record_store.py', '.'), ('.venv/record_browser.py', '.'), ('.venv/printer_control.py', '.'), ('.venv/admin_window.py', '.'), ('.venv/gui.py', '.'), ('.venv/app_controller.py', '.'), ('.venv/app_locator.py', '.'), ('.venv/process_monitor.py', '.'), ('.venv/auto_close.py', '.'), ('.venv/log_service.py', '.'), ('.venv/usage_analytics.py', '.'), ('.venv/notification_service.py', '.')],
     hiddenimports=['tkinter'],
     hookspath=[],
     hooksconfig={},
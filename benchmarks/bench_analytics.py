@@ -0,0 +1,77 @@
+"""使用统计增量更新基准测试
+
+在 1M 条合成历史记录的基础上逐条追加记录，测量每条记录的增量统计耗时，
+并与全量重算对比，验证增量更新的耗时与历史规模无关。
+
+用法：
+    python benchmarks/bench_analytics.py [--rows 1000000] [--appends 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.venv'))
+
+from record_store import RecordStore  # noqa: E402
+from usage_analytics import UsageAnalytics  # noqa: E402
+
+
+def populate(store, rows):
+    """批量写入合成历史记录"""
+    rng = random.Random(42)
+    base = time.mktime((2023, 1, 1, 0, 0, 0, 0, 0, -1))
+    conn = store._connect()
+    with conn:
+        conn.executemany(
+            'INSERT INTO records (timestamp, user_name, project_name, student_id, status)'
+            ' VALUES (?, ?, ?, ?, ?)',
+            (
+                (
+                    time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(base + i * 60)),
+                    f'用户{rng.randrange(5000)}',
+                    f'项目{rng.randrange(800)}',
+                    f'{rng.randrange(10000000, 10005000)}',
+                    '开始打印',
+                )
+                for i in range(rows)
+            )
+        )
+
+
+def measure_appends(store, analytics, appends):
+    """逐条追加记录并增量更新，返回每条的平均耗时（毫秒）"""
+    started = time.perf_counter()
+    for i in range(appends):
+        store.append(time.strftime('%Y-%m-%d %H:%M:%S'), '基准', '基准项目', f'{20000000 + i}', '开始打印')
+        analytics.catch_up()
+    return (time.perf_counter() - started) / appends * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000, help='合成历史记录条数')
+    parser.add_argument('--appends', type=int, default=1000, help='增量追加的记录条数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'print_records.db')
+        store = RecordStore(db_path)
+        analytics = UsageAnalytics(db_path)
+
+        for size in sorted({min(args.rows, 1000), args.rows}):
+            current = store.count()
+            populate(store, size - current)
+
+            started = time.perf_counter()
+            analytics.rebuild()
+            rebuild_s = time.perf_counter() - started
+
+            per_record_ms = measure_appends(store, analytics, args.appends)
+            print(f'history={size:>9,}  rebuild={rebuild_s:8.3f}s  incremental={per_record_ms:.3f} ms/record')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""应用程序查找基准测试
+
+用 workload.py 生成伪切片软件安装目录树，比较 os.walk（原实现）与 AppLocator
+在不同线程数下的耗时：查找不存在的程序（遍历整棵树）、查找树中最深处的目标，
+以及缓存命中。完全离线运行，不需要 Windows。
+
+os.walk 按目录列表顺序深度优先遍历，找到目标的早晚取决于文件系统返回的顺序，
+因此以完整遍历的耗时为主要对比。
+
+用法：
+    python benchmarks/bench_locator.py [--dirs 6] [--depth 6] [--files 6] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '.venv'))
+sys.path.insert(0, BENCH_DIR)
+
+from app_locator import AppLocator  # noqa: E402
+from workload import write_slicer_tree  # noqa: E402
+
+APP_NAME = 'bambu-studio.exe'
+MISSING_NAME = 'not-installed.exe'
+
+
+def os_walk(root, app_name):
+    """原实现：os.walk 逐个目录遍历"""
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if app_name.lower() in name.lower():
+                return os.path.join(directory, name)
+    return None
+
+
+def median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--dirs', type=int, default=6, help='每层子目录数')
+    parser.add_argument('--depth', type=int, default=6, help='目录深度')
+    parser.add_argument('--files', type=int, default=6, help='每个目录的文件数')
+    parser.add_argument('--repeat', type=int, default=5, help='计时次数')
+    parser.add_argument('--workers', default='1,2,4,8', help='比较的线程数，逗号分隔')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tree = os.path.join(tmp, 'Program Files')
+        target = write_slicer_tree(tree, args.dirs, args.depth, args.files, APP_NAME)
+        directories = sum(1 for _ in os.walk(tree))
+        print(f'tree: {directories} directories, target at depth {args.depth}')
+
+        os_walk(tree, MISSING_NAME)  # 预热文件系统缓存
+        print(f'{"":24s} {"full walk":>10s} {"find":>10s}')
+        print(f'{"os.walk":24s} {median_ms(lambda: os_walk(tree, MISSING_NAME), args.repeat):8.1f} ms'
+              f' {median_ms(lambda: os_walk(tree, APP_NAME), args.repeat):8.1f} ms')
+
+        for workers in [int(value) for value in args.workers.split(',')]:
+            locator = AppLocator(cache_file=os.path.join(tmp, 'cache.json'), max_depth=args.depth + 1,
+                                 max_workers=workers, install_dirs=[tree], drive_roots=[])
+
+            def walk(app_name):
+                return locator._walk(app_name, [tree], threading.Event())
+
+            assert os.path.samefile(walk(APP_NAME), target) and walk(MISSING_NAME) is None
+            print(f'{f"AppLocator workers={workers}":24s}'
+                  f' {median_ms(lambda: walk(MISSING_NAME), args.repeat):8.1f} ms'
+                  f' {median_ms(lambda: walk(APP_NAME), args.repeat):8.1f} ms')
+
+        locator.remember(APP_NAME, target)
+        print(f'{"AppLocator cached":24s} {median_ms(lambda: locator.find(APP_NAME), args.repeat * 100):8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
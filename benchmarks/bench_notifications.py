@@ -0,0 +1,128 @@
+"""邮件通知吞吐量基准测试
+
+启动一个本地 SMTP 收件服务（仅接收并计数，不投递），向队列写入几千条通知，
+测量入队速度、批量发送速度和使用的 SMTP 连接数，并验证失败重试和死信流程。
+完全离线运行。
+
+用法：
+    python benchmarks/bench_notifications.py [--jobs 3000]
+"""
+import argparse
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.venv'))
+
+from notification_service import NotificationDispatcher, NotificationQueue  # noqa: E402
+
+
+class SMTPSink(socketserver.ThreadingTCPServer):
+    """最小化的本地 SMTP 服务，只统计收到的邮件和连接数"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.messages = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections += 1
+        self.reply('220 localhost sink')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith('EHLO'):
+                self.reply('250-localhost')
+                self.reply('250 8BITMIME')
+            elif command.startswith(('HELO', 'MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                with self.server.lock:
+                    self.server.messages += 1
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+def enqueue_jobs(queue, jobs, due_at):
+    started = time.perf_counter()
+    for i in range(jobs):
+        queue.enqueue(due_at, f'student{i}@example.com', f'学生{i}', f'项目{i % 50}', f'{10000000 + i}')
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=3000, help='通知数量')
+    parser.add_argument('--batch-window', type=float, default=60.0, help='合并发送窗口（秒）')
+    args = parser.parse_args()
+
+    sink = SMTPSink()
+    threading.Thread(target=sink.serve_forever, daemon=True).start()
+    smtp_config = {'host': '127.0.0.1', 'port': sink.server_address[1], 'sender': 'printer@example.com'}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = NotificationQueue(os.path.join(tmp, 'print_records.db'))
+
+        # 到期时间分散在 batch_window 内，验证会合并为同一批发送
+        now = time.time()
+        enqueue_s = enqueue_jobs(queue, args.jobs, now)
+        dispatcher = NotificationDispatcher(queue, smtp_config, batch_window=args.batch_window,
+                                            dead_letter_file=os.path.join(tmp, 'dead.jsonl'))
+        started = time.perf_counter()
+        sent = dispatcher.dispatch_due()
+        dispatch_s = time.perf_counter() - started
+
+        print(f'enqueue:  {args.jobs} jobs in {enqueue_s:.3f}s ({args.jobs / enqueue_s:,.0f}/s)')
+        print(f'dispatch: {sent} sent in {dispatch_s:.3f}s ({sent / dispatch_s:,.0f}/s), '
+              f'{sink.connections} SMTP connection(s), sink received {sink.messages}')
+
+        # 失败重试与死信：使用假时钟推进时间，连接始终失败
+        clock = [time.time()]
+        failing_queue = NotificationQueue(os.path.join(tmp, 'failing.db'), clock=lambda: clock[0])
+        failing_queue.enqueue(clock[0], 'nobody@example.com', '测试', '测试项目', '00000000')
+
+        def refuse(config):
+            raise ConnectionRefusedError('offline')
+
+        failing = NotificationDispatcher(failing_queue, smtp_config, batch_window=60, max_attempts=4,
+                                         base_backoff=60, dead_letter_file=os.path.join(tmp, 'dead.jsonl'),
+                                         smtp_factory=refuse)
+        retries = []
+        for _ in range(10):
+            failing.dispatch_due()
+            next_due = failing_queue.next_due()
+            if next_due is None:
+                break
+            retries.append(round(next_due - clock[0]))
+            clock[0] = next_due
+        with open(os.path.join(tmp, 'dead.jsonl'), encoding='utf-8') as f:
+            dead = sum(1 for _ in f)
+        print(f'retry backoff (s): {retries}, final status: {failing_queue.counts()}, dead letters: {dead}')
+
+    sink.shutdown()
+
+
+if __name__ == '__main__':
+    main()
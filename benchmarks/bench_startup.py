@@ -0,0 +1,131 @@
+"""启动耗时基准测试
+
+在子进程中启动登记助手，测量模块导入耗时、第一帧显示耗时（主窗口 <Map> 和
+<Expose> 事件）、后台服务开始初始化和初始化完成的耗时。服务应在第一次 <Expose>
+之后才开始初始化。没有 DISPLAY 时自动启动 Xvfb，可在 Linux 上无界面运行。
+
+用法：
+    python benchmarks/bench_startup.py [--repeat 5] [--json]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.venv')
+
+
+def run_child():
+    """子进程：启动程序并输出各阶段耗时（毫秒，JSON）"""
+    started = time.perf_counter()
+    sys.path.insert(0, SOURCE_DIR)
+
+    import main
+    import gui  # noqa: F401  create_app 中导入，这里提前导入以单独计时
+    imported = time.perf_counter()
+
+    marks = {}
+    create_services = main.create_services
+
+    def timed_create_services():
+        marks.setdefault('services_start', time.perf_counter())
+        return create_services()
+
+    main.create_services = timed_create_services
+    app = main.create_app()
+    created = time.perf_counter()
+
+    def on_map(event):
+        if event.widget is app.root and 'first_frame' not in marks:
+            marks['first_frame'] = time.perf_counter()
+
+    def on_expose(event):
+        if event.widget is app.root and 'first_expose' not in marks:
+            marks['first_expose'] = time.perf_counter()
+
+    app.root.bind('<Map>', on_map, add='+')
+    app.root.bind('<Expose>', on_expose, add='+')
+
+    deadline = time.perf_counter() + 60
+    while time.perf_counter() < deadline:
+        app.root.update()
+        if 'first_frame' in marks and app.data_manager is not None:
+            marks['services_ready'] = time.perf_counter()
+            break
+        time.sleep(0.001)
+
+    result = {
+        'import_ms': (imported - started) * 1000,
+        'create_window_ms': (created - started) * 1000,
+        'first_frame_ms': (marks.get('first_frame', float('nan')) - started) * 1000,
+        'first_expose_ms': (marks.get('first_expose', float('nan')) - started) * 1000,
+        'services_start_ms': (marks.get('services_start', float('nan')) - started) * 1000,
+        'services_ready_ms': (marks.get('services_ready', float('nan')) - started) * 1000,
+        'first_frame_wall': time.time() - (time.perf_counter() - marks.get('first_frame', time.perf_counter())),
+    }
+
+    if app.app_controller:
+        app.app_controller.monitor.stop()
+        app.app_controller.scheduler.stop()
+    app.root.destroy()
+    print(json.dumps(result))
+
+
+def ensure_display():
+    """没有 DISPLAY 时启动 Xvfb，返回 Xvfb 进程（不需要时返回 None）"""
+    if os.environ.get('DISPLAY') or sys.platform == 'win32':
+        return None
+    if not shutil.which('Xvfb'):
+        sys.exit('没有可用的 DISPLAY，且未安装 Xvfb')
+    display = ':99'
+    xvfb = subprocess.Popen(['Xvfb', display, '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = display
+    time.sleep(0.5)
+    return xvfb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='启动次数')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出结果')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    xvfb = ensure_display()
+    samples = []
+    try:
+        for _ in range(args.repeat):
+            # 每次在空的临时目录中启动，模拟首次冷启动且不污染仓库数据
+            with tempfile.TemporaryDirectory() as workdir:
+                spawned = time.time()
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), '--child'],
+                    cwd=workdir, capture_output=True, text=True, check=True
+                ).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                result['process_to_first_frame_ms'] = (result.pop('first_frame_wall') - spawned) * 1000
+                samples.append(result)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    summary = {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+    if args.json:
+        print(json.dumps({'repeat': args.repeat, 'median_ms': summary}, indent=2))
+    else:
+        for key, value in summary.items():
+            print(f'{key:28s} {value:8.1f} ms (median of {args.repeat})')
+
+
+if __name__ == '__main__':
+    main()
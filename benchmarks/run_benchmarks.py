@@ -0,0 +1,382 @@
+"""登记流程热点路径基准测试
+
+在临时目录中用合成数据（见 workload.py）测量：
+  - DataManager：旧版 CSV 导入、save_print_record（单条与连续登记）、
+    get_user_history、get_recent_records
+  - 管理员记录浏览：与 AdminWindow._view_records 相同的后台分页查询
+  - AppController：_find_app_path（伪安装目录树）和 is_running
+  - admin_config.json 的读取与保存
+
+不创建任何窗口，不需要 DISPLAY 和 Windows API；没有安装 tkinter 时使用空模块代替。
+结果以 JSON 输出，--compare 与基准结果对比，超过阈值的项目视为性能退化并以非零状态退出。
+
+用法：
+    python benchmarks/run_benchmarks.py [--sizes 1000,10000,100000] [--output results.json]
+    python benchmarks/run_benchmarks.py --compare baseline.json [--threshold 0.25] [--min-delta-ms 1]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', '.venv'))
+sys.path.insert(0, BENCH_DIR)
+
+
+def _install_tk_stub():
+    """没有 tkinter 时注入空模块，只保证 GUI 模块可以导入（不会创建窗口）"""
+    try:
+        import tkinter  # noqa: F401
+        return False
+    except ImportError:
+        pass
+
+    class _Anything:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __getattr__(self, name):
+            return _Anything()
+
+        def __call__(self, *args, **kwargs):
+            return _Anything()
+
+    def stub_module(name):
+        module = types.ModuleType(name)
+        module.__getattr__ = lambda attr: _Anything
+        sys.modules[name] = module
+        return module
+
+    tk = stub_module('tkinter')
+    for sub in ('ttk', 'messagebox', 'filedialog'):
+        setattr(tk, sub, stub_module(f'tkinter.{sub}'))
+    return True
+
+
+TK_STUBBED = _install_tk_stub()
+
+import psutil  # noqa: E402
+
+import admin_window  # noqa: E402
+import log_service  # noqa: E402
+from admin_window import AdminWindow  # noqa: E402
+from app_controller import AppController  # noqa: E402
+from app_locator import AppLocator  # noqa: E402
+from data_manager import DataManager  # noqa: E402
+from record_browser import RecordBrowser, RecordQueryWorker  # noqa: E402
+from workload import write_records_csv, write_slicer_tree  # noqa: E402
+
+SLICER_NAME = 'bambu-studio.exe'
+
+
+class _Silent:
+    """代替 messagebox，基准测试中不弹窗"""
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class _Entry:
+    """代替 ttk.Entry，只提供 get()"""
+
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+
+def measure(fn, repeat=20, warmup=1, setup=None):
+    """
+    多次执行 fn 并统计耗时
+
+    Args:
+        fn (callable): 被测函数
+        repeat (int): 计时次数
+        warmup (int): 预热次数（不计时）
+        setup (callable, optional): 每次执行前调用，不计入耗时
+
+    Returns:
+        dict: median_ms、p95_ms、min_ms、max_ms、runs
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'median_ms': statistics.median(samples),
+        'p95_ms': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'min_ms': samples[0],
+        'max_ms': samples[-1],
+        'runs': repeat,
+    }
+
+
+def single_run(fn):
+    """只执行一次的宏基准"""
+    started = time.perf_counter()
+    fn()
+    elapsed = (time.perf_counter() - started) * 1000
+    return {'median_ms': elapsed, 'p95_ms': elapsed, 'min_ms': elapsed, 'max_ms': elapsed, 'runs': 1}
+
+
+def quiet_console():
+    """关闭控制台日志输出（文件日志照常写入，调用线程的开销不变）"""
+    listener = log_service._listener
+    if listener is None:
+        return
+    for handler in listener.handlers:
+        if type(handler).__name__ == 'StreamHandler':
+            handler.setLevel(100)
+
+
+# ----------------------------------------------------------------------
+# 记录相关
+# ----------------------------------------------------------------------
+def load_view(worker, filters=None, order_by='id', descending=False, offset=0):
+    """按 RecordBrowser 的方式请求总数和一个数据块，等待两个结果都返回"""
+    generation = worker.new_generation()
+    worker.submit(generation, 'count', filters=filters or {})
+    worker.submit(generation, 'page', filters=filters or {}, order_by=order_by, descending=descending,
+                  offset=offset, limit=RecordBrowser.BLOCK_SIZE)
+    pending = {'count', 'page'}
+    while pending:
+        result_generation, kind, _, _ = worker.results.get(timeout=60)
+        if result_generation == generation:
+            pending.discard(kind)
+
+
+def bench_records(workdir, rows, args, results):
+    base_dir = os.path.join(workdir, f'rows_{rows}', '.venv')
+    os.makedirs(os.path.join(base_dir, 'data'))
+    generator = write_records_csv(os.path.join(base_dir, 'data', 'print_records.csv'), rows)
+    suffix = f'rows={rows}'
+
+    holder = {}
+    results[f'datamanager_init_import/{suffix}'] = single_run(
+        lambda: holder.setdefault('dm', DataManager(base_dir=base_dir)))
+    dm = holder['dm']
+
+    students = generator.students[:50]
+    cycle = iter(range(1 << 30))
+    results[f'get_user_history_by_id/{suffix}'] = measure(
+        lambda: dm.get_user_history(email=students[next(cycle) % len(students)][1]), args.repeat)
+    results[f'get_user_history_by_name/{suffix}'] = measure(
+        lambda: dm.get_user_history(user_name=students[next(cycle) % len(students)][0]), args.repeat)
+    results[f'get_recent_records/{suffix}'] = measure(lambda: dm.get_recent_records(10), args.repeat)
+
+    name, student_id = students[0]
+    results[f'save_print_record/{suffix}'] = measure(
+        lambda: dm.save_print_record(name, '基准测试', student_id), args.repeat)
+
+    def burst():
+        for i in range(args.burst):
+            dm.save_print_record(name, f'连续登记{i}', student_id)
+    stats = measure(burst, repeat=3, warmup=0)
+    stats['per_record_ms'] = stats['median_ms'] / args.burst
+    results[f'save_print_record_burst{args.burst}/{suffix}'] = stats
+
+    worker = RecordQueryWorker(dm.store)
+    try:
+        results[f'view_records_first_block/{suffix}'] = measure(lambda: load_view(worker), args.repeat)
+        results[f'view_records_filtered/{suffix}'] = measure(
+            lambda: load_view(worker, filters={'student_id': student_id[:4]}), args.repeat)
+        results[f'view_records_sorted_deep/{suffix}'] = measure(
+            lambda: load_view(worker, order_by='timestamp', descending=True, offset=rows // 2), args.repeat)
+    finally:
+        worker.stop()
+
+    dm.analytics.close()
+    dm.store.close()
+
+
+# ----------------------------------------------------------------------
+# 应用程序控制
+# ----------------------------------------------------------------------
+def spawn_children(count):
+    """启动若干空闲子进程，返回 (进程列表, 进程名)"""
+    children = [
+        subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(600)'])
+        for _ in range(count)
+    ]
+    return children, psutil.Process(children[0].pid).name()
+
+
+def bench_app_controller(workdir, args, results):
+    tree = os.path.join(workdir, 'Program Files')
+    target = write_slicer_tree(tree, args.tree_dirs, args.tree_depth, args.tree_files, SLICER_NAME)
+    cache_file = os.path.join(workdir, 'app_paths.json')
+
+    children, child_name = spawn_children(args.children)
+    controller = AppController(child_name, app_path=sys.executable)
+    controller.locator = AppLocator(cache_file=cache_file, install_dirs=[tree], drive_roots=[])
+    try:
+        def forget():
+            controller.locator._cache.clear()
+            if os.path.exists(cache_file):
+                os.remove(cache_file)
+
+        def find():
+            assert os.path.samefile(controller._find_app_path(SLICER_NAME), target)
+
+        results['find_app_path_walk'] = measure(find, repeat=max(3, args.repeat // 4), setup=forget)
+        results['find_app_path_cached'] = measure(find, args.repeat)
+
+        results['is_running_monitored'] = measure(lambda: controller.is_running(child_name), args.repeat * 10)
+        results['is_running_process_scan'] = measure(
+            lambda: controller.is_running('not-a-running-process.exe'), args.repeat)
+    finally:
+        controller.monitor.stop()
+        controller.scheduler.stop()
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+# ----------------------------------------------------------------------
+# 管理员配置
+# ----------------------------------------------------------------------
+def bench_admin_config(workdir, args, results):
+    config_dir = os.path.join(workdir, 'config')
+    os.makedirs(config_dir)
+    cwd = os.getcwd()
+    os.chdir(config_dir)
+    messagebox = admin_window.messagebox
+    admin_window.messagebox = _Silent()
+    try:
+        window = AdminWindow()
+        results['admin_config_load'] = measure(window._load_admin_password, args.repeat)
+
+        window.new_password_entry = _Entry('benchmark')
+        results['admin_config_save_password'] = measure(window._change_password, args.repeat)
+
+        window.auto_close_entry = _Entry('30')
+        window.idle_close_entry = _Entry('15')
+        results['admin_config_save_auto_close'] = measure(window._save_auto_close_time, args.repeat)
+    finally:
+        admin_window.messagebox = messagebox
+        os.chdir(cwd)
+
+
+# ----------------------------------------------------------------------
+# 结果对比
+# ----------------------------------------------------------------------
+def compare(current, baseline, threshold, min_delta_ms):
+    """
+    与基准结果对比
+
+    中位数变慢超过 threshold，且绝对差异同时超过 min_delta_ms 和基准自身的
+    波动（p95 - 中位数）时才视为退化，避免把运行间的噪声报为退化。
+
+    Returns:
+        list: 退化项目 (名称, 基准耗时, 当前耗时, 比值)
+    """
+    regressions = []
+    print(f"{'benchmark':48s} {'baseline':>10s} {'current':>10s} {'ratio':>7s}")
+    for name, stats in sorted(current['results'].items()):
+        base = baseline['results'].get(name)
+        if base is None:
+            print(f'{name:48s} {"-":>10s} {stats["median_ms"]:10.3f} {"new":>7s}')
+            continue
+        ratio = stats['median_ms'] / base['median_ms'] if base['median_ms'] else float('inf')
+        noise_ms = max(min_delta_ms, base.get('p95_ms', base['median_ms']) - base['median_ms'])
+        regressed = (ratio > 1 + threshold
+                     and stats['median_ms'] - base['median_ms'] > noise_ms)
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:48s} {base["median_ms"]:10.3f} {stats["median_ms"]:10.3f} {ratio:7.2f}{flag}')
+        if regressed:
+            regressions.append((name, base['median_ms'], stats['median_ms'], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        help='历史记录条数，逗号分隔（完整测试：1000,10000,100000,1000000）')
+    parser.add_argument('--repeat', type=int, default=20, help='微基准的计时次数')
+    parser.add_argument('--burst', type=int, default=200, help='连续登记的记录数')
+    parser.add_argument('--children', type=int, default=3, help='is_running 测试的子进程数')
+    parser.add_argument('--tree-dirs', type=int, default=5, help='伪安装目录树每层子目录数')
+    parser.add_argument('--tree-depth', type=int, default=5, help='伪安装目录树深度')
+    parser.add_argument('--tree-files', type=int, default=6, help='伪安装目录树每个目录的文件数')
+    parser.add_argument('--only', choices=['records', 'app', 'config'], action='append',
+                        help='只运行指定分组（可重复）')
+    parser.add_argument('--output', help='结果 JSON 文件（默认输出到标准输出）')
+    parser.add_argument('--compare', metavar='BASELINE', help='与基准结果 JSON 对比')
+    parser.add_argument('--threshold', type=float, default=0.25, help='中位数变慢超过该比例视为退化')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                        help='忽略小于该值（及基准 p95 与中位数之差）的绝对差异')
+    parser.add_argument('--keep', action='store_true', help='保留临时工作目录')
+    args = parser.parse_args()
+    groups = set(args.only or ['records', 'app', 'config'])
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+
+    workdir = tempfile.mkdtemp(prefix='printer_bench_')
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    log_service.setup_logging(os.path.join(workdir, 'logs'))
+    quiet_console()
+
+    results = {}
+    try:
+        if 'records' in groups:
+            for rows in sizes:
+                bench_records(workdir, rows, args, results)
+        if 'app' in groups:
+            bench_app_controller(workdir, args, results)
+        if 'config' in groups:
+            bench_admin_config(workdir, args, results)
+    finally:
+        log_service.shutdown_logging()
+        os.chdir(cwd)
+        if args.keep:
+            print(f'工作目录: {workdir}', file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'sizes': sizes,
+            'tk_stubbed': TK_STUBBED,
+        },
+        'results': results,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    elif not args.compare:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f'{len(regressions)} regression(s) over {args.threshold:.0%}', file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
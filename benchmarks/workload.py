@@ -0,0 +1,129 @@
+"""合成工作负载生成器
+
+生成与真实数据格式一致的 print_records.csv 历史记录（中文姓名、8 位学号），
+以及用于测试应用查找的伪切片软件安装目录树。
+
+用法：
+    python benchmarks/workload.py records out.csv --rows 100000
+    python benchmarks/workload.py tree out_dir --dirs 5 --depth 5 --files 6
+"""
+import argparse
+import csv
+import os
+import random
+from datetime import datetime, timedelta
+
+SURNAMES = '王李张刘陈杨黄赵吴周徐孙马朱胡郭何高林罗郑梁谢宋唐许韩冯邓曹彭曾肖田董袁潘于蒋蔡余杜叶程苏魏吕丁任沈'
+GIVEN_CHARS = '伟芳娜敏静丽强磊军洋勇艳杰娟涛明超秀霞平刚桂英华玉萍红鹏飞宇浩然子轩思雨欣怡晨阳博文'
+PROJECT_WORDS = ['机械臂', '无人机', '小车', '外壳', '齿轮', '支架', '夹具', '模型', '零件', '传感器底座',
+                 '课程设计', '毕业设计', '竞赛', '样机', '测试件']
+
+RECORD_HEADERS = ['timestamp', 'user_name', 'project_name', 'student_id', 'status']
+
+
+class RecordGenerator:
+    """按固定随机种子生成打印记录，同样的参数总是得到同样的数据"""
+
+    def __init__(self, seed: int = 42, students: int = 5000, projects: int = 800,
+                 start: datetime = datetime(2023, 9, 1, 8, 0, 0)):
+        self.rng = random.Random(seed)
+        self.students = [
+            (self._name(), f'{self.rng.randrange(10000000, 100000000):08d}')
+            for _ in range(students)
+        ]
+        self.projects = [
+            f'{self.rng.choice(PROJECT_WORDS)}{self.rng.randrange(1, 100)}' for _ in range(projects)
+        ]
+        self.current = start
+
+    def _name(self) -> str:
+        given = ''.join(self.rng.choice(GIVEN_CHARS) for _ in range(self.rng.choice((1, 2))))
+        return self.rng.choice(SURNAMES) + given
+
+    def student(self):
+        """随机选一个学生（少数学生使用频率更高）"""
+        index = min(int(self.rng.paretovariate(1.2)) - 1, len(self.students) - 1)
+        if self.rng.random() < 0.5:
+            index = self.rng.randrange(len(self.students))
+        return self.students[index]
+
+    def record(self) -> list:
+        """生成下一条记录，时间集中在工作日白天"""
+        self.current += timedelta(seconds=self.rng.randrange(30, 900))
+        if self.current.hour >= 22:
+            self.current = (self.current + timedelta(days=1)).replace(hour=8, minute=0)
+        name, student_id = self.student()
+        return [self.current.strftime('%Y-%m-%d %H:%M:%S'), name, self.rng.choice(self.projects),
+                student_id, '开始打印']
+
+    def records(self, rows: int):
+        for _ in range(rows):
+            yield self.record()
+
+
+def write_records_csv(path: str, rows: int, seed: int = 42) -> RecordGenerator:
+    """
+    写出 rows 条记录的 print_records.csv
+
+    Returns:
+        RecordGenerator: 生成器（可用于获取样本学号等）
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    generator = RecordGenerator(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(RECORD_HEADERS)
+        writer.writerows(generator.records(rows))
+    return generator
+
+
+def write_slicer_tree(root: str, dirs_per_level: int = 5, depth: int = 5, files_per_dir: int = 6,
+                      app_name: str = 'bambu-studio.exe') -> str:
+    """
+    生成伪安装目录树，目标可执行文件放在最后一个分支的最深处
+
+    Returns:
+        str: 目标可执行文件路径
+    """
+    def build(directory, level):
+        os.makedirs(directory, exist_ok=True)
+        for i in range(files_per_dir):
+            open(os.path.join(directory, f'lib{i}.dll'), 'w').close()
+        if level < depth:
+            for i in range(dirs_per_level):
+                build(os.path.join(directory, f'dir{i}'), level + 1)
+
+    build(root, 1)
+    target_dir = os.path.join(root, *[f'dir{dirs_per_level - 1}'] * (depth - 1), 'Bambu Studio')
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, app_name)
+    open(target, 'w').close()
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    records = subparsers.add_parser('records', help='生成 print_records.csv')
+    records.add_argument('path')
+    records.add_argument('--rows', type=int, default=100000)
+    records.add_argument('--seed', type=int, default=42)
+
+    tree = subparsers.add_parser('tree', help='生成伪切片软件安装目录树')
+    tree.add_argument('path')
+    tree.add_argument('--dirs', type=int, default=5, help='每层子目录数')
+    tree.add_argument('--depth', type=int, default=5, help='目录深度')
+    tree.add_argument('--files', type=int, default=6, help='每个目录的文件数')
+
+    args = parser.parse_args()
+    if args.command == 'records':
+        write_records_csv(args.path, args.rows, args.seed)
+        print(f'wrote {args.rows} records to {args.path}')
+    else:
+        target = write_slicer_tree(args.path, args.dirs, args.depth, args.files)
+        print(f'wrote tree under {args.path}, target: {target}')
+
+
+if __name__ == '__main__':
+    main()
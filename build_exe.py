@@ -1,17 +1,38 @@
+import argparse
+
 import PyInstaller.__main__
 
-PyInstaller.__main__.run([
+# 打包方式：
+#   onefile - 单个文件，每次启动都要先解压到临时目录，启动较慢
+#   onedir  - 输出目录，不使用UPX压缩，免去解压步骤，适合每天重启的登记终端
+PROFILES = {
+    'onefile': ['--onefile'],
+    'onedir': ['--onedir', '--noupx'],
+}
+
+parser = argparse.ArgumentParser(description='打包3D打印机使用登记助手')
+parser.add_argument('--profile', choices=sorted(PROFILES), default='onefile', help='打包方式')
+args = parser.parse_args()
+
+PyInstaller.__main__.run(PROFILES[args.profile] + [
     '--name=PrinterAssistant',  # 可执行文件的名称
-    '--onefile',                # 打包成单个文件
     '--windowed',               # 不显示控制台窗口
     '--add-data=.venv/data/print_records.csv;.venv/data',  # 添加数据文件
     '--add-data=admin_config.json;.',  # 添加配置文件
     '--add-data=.venv/logs;logs',  # 添加日志目录
     '--add-data=.venv/data_manager.py;.',  # 添加数据管理器
+    '--add-data=.venv/record_store.py;.',  # 添加记录存储
+    '--add-data=.venv/record_browser.py;.',  # 添加记录浏览器
     '--add-data=.venv/printer_control.py;.',  # 添加打印控制
     '--add-data=.venv/admin_window.py;.',  # 添加管理员窗口
     '--add-data=.venv/gui.py;.',  # 添加GUI
     '--add-data=.venv/app_controller.py;.',  # 添加应用控制器
+    '--add-data=.venv/app_locator.py;.',  # 添加应用查找器
+    '--add-data=.venv/process_monitor.py;.',  # 添加进程监视器
+    '--add-data=.venv/auto_close.py;.',  # 添加定时关闭调度器
+    '--add-data=.venv/log_service.py;.',  # 添加日志服务
+    '--add-data=.venv/usage_analytics.py;.',  # 添加使用统计
+    '--add-data=.venv/notification_service.py;.',  # 添加邮件通知
     '--hidden-import=tkinter',  # 确保tkinter被正确导入
     '.venv/main.py'  # 主程序入口
 ]) 
\ No newline at end of file
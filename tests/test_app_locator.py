@@ -0,0 +1,65 @@
+import os
+import threading
+
+import pytest
+
+from app_locator import AppLocator
+from workload import write_slicer_tree
+
+APP_NAME = 'bambu-studio.exe'
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = str(tmp_path / 'Program Files')
+    target = write_slicer_tree(root, dirs_per_level=4, depth=4, files_per_dir=3, app_name=APP_NAME)
+    return root, target
+
+
+def make_locator(tmp_path, root, **kwargs):
+    return AppLocator(cache_file=str(tmp_path / 'app_paths.json'), install_dirs=[root],
+                      drive_roots=[], **kwargs)
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_find_deepest_target(tmp_path, tree, max_workers):
+    root, target = tree
+    locator = make_locator(tmp_path, root, max_workers=max_workers)
+    locator.SCAN_BATCH = 16  # 让遍历拆分成多个批次
+
+    assert os.path.samefile(locator.find(APP_NAME), target)
+    # 找到后写入缓存，新的查找器直接命中
+    assert os.path.samefile(make_locator(tmp_path, root).find_quick(APP_NAME), target)
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_missing_app_scans_whole_tree(tmp_path, tree, max_workers):
+    root, _ = tree
+    locator = make_locator(tmp_path, root, max_workers=max_workers)
+    locator.SCAN_BATCH = 16
+    progress = []
+
+    assert locator.find('missing.exe', on_progress=lambda count, _: progress.append(count)) is None
+    assert progress[-1] == sum(1 for _ in os.walk(root))
+
+
+def test_max_depth_limits_walk(tmp_path, tree):
+    root, _ = tree
+    assert make_locator(tmp_path, root, max_depth=2).find(APP_NAME) is None
+
+
+def test_cancelled_walk_returns_none(tmp_path, tree):
+    root, _ = tree
+    cancel_event = threading.Event()
+    cancel_event.set()
+    assert make_locator(tmp_path, root).find(APP_NAME, cancel_event=cancel_event) is None
+
+
+def test_find_async_reports_result(tmp_path, tree):
+    root, target = tree
+    done = []
+    task = make_locator(tmp_path, root, max_workers=4).find_async(APP_NAME, on_done=done.append)
+
+    assert os.path.samefile(task.wait(10), target)
+    task.thread.join(10)
+    assert done == [task.result]
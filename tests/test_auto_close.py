@@ -0,0 +1,218 @@
+import random
+import threading
+
+import pytest
+
+from auto_close import AutoCloseScheduler, IdlePolicy
+
+SESSIONS = 500
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeSampler:
+    """按 PID 返回累计的 (CPU 秒数, IO 字节数)，busy 中的进程每次采样都有增量"""
+
+    def __init__(self):
+        self.usage = {}
+        self.busy = set()
+        self.exited = set()
+
+    def __call__(self, pids):
+        pids = [pid for pid in pids if pid not in self.exited]
+        if not pids:
+            return None
+        for pid in pids:
+            cpu, io = self.usage.get(pid, (0.0, 0))
+            if pid in self.busy:
+                cpu, io = cpu + 5.0, io + 10 * 1024 * 1024
+            self.usage[pid] = (cpu, io)
+        return (sum(self.usage[pid][0] for pid in pids), sum(self.usage[pid][1] for pid in pids))
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def sampler():
+    return FakeSampler()
+
+
+@pytest.fixture
+def scheduler(clock, sampler):
+    return AutoCloseScheduler(clock=clock, sampler=sampler)
+
+
+def drive(scheduler, clock, until, step=1.0):
+    """推进假时钟并处理到期条目"""
+    while clock.now < until:
+        clock.advance(step)
+        scheduler.run_pending()
+
+
+def test_hundreds_of_sessions_close_at_their_deadline(scheduler, clock):
+    rng = random.Random(1)
+    delays = [rng.randrange(60, 7200) for _ in range(SESSIONS)]
+    closed = {}
+    for index, delay in enumerate(delays):
+        scheduler.schedule(delay, (lambda i: lambda: closed.setdefault(i, clock.now))(index))
+    start = clock.now
+
+    drive(scheduler, clock, start + 7200, step=30)
+
+    assert scheduler.active_sessions() == 0
+    assert sorted(closed) == list(range(SESSIONS))
+    for index, closed_at in closed.items():
+        assert start + delays[index] <= closed_at < start + delays[index] + 30
+
+
+def test_cancel_and_reschedule(scheduler, clock):
+    closed = []
+    ids = [scheduler.schedule(600, (lambda i: lambda: closed.append((i, clock.now)))(i)) for i in range(SESSIONS)]
+    start = clock.now
+
+    cancelled = set(ids[0::3])
+    for session_id in cancelled:
+        assert scheduler.cancel(session_id)
+    assert not scheduler.cancel(ids[0])
+
+    # 一部分从现在起推迟，一部分从开始时间起缩短
+    clock.advance(100)
+    postponed = set(ids[1::3])
+    for session_id in postponed:
+        assert scheduler.reschedule(session_id, 900)
+        assert scheduler.deadline_of(session_id) == start + 100 + 900
+    shortened = set(ids[2::3])
+    for session_id in shortened:
+        assert scheduler.reschedule(session_id, 300, from_start=True)
+    scheduler.run_pending()
+    assert closed == []
+
+    drive(scheduler, clock, start + 2000, step=10)
+
+    by_index = dict(closed)
+    assert len(closed) == len(postponed) + len(shortened)
+    for index, session_id in enumerate(ids):
+        if session_id in cancelled:
+            assert index not in by_index
+        elif session_id in postponed:
+            assert start + 1000 <= by_index[index] < start + 1010
+        else:
+            assert start + 300 <= by_index[index] < start + 310
+    assert scheduler.active_sessions() == 0
+
+
+def test_from_start_reschedule_already_past_closes_immediately(scheduler, clock):
+    closed = []
+    ids = [scheduler.schedule(3600, (lambda i: lambda: closed.append(i))(i)) for i in range(SESSIONS)]
+    clock.advance(1800)
+    scheduler.run_pending()
+    assert closed == []
+
+    # 管理员把定时关闭改为 20 分钟：已经运行 30 分钟的会话立即到期
+    scheduler.reschedule_all(20 * 60)
+    assert all(scheduler.deadline_of(session_id) < clock.now for session_id in ids)
+    scheduler.run_pending()
+
+    assert sorted(closed) == list(range(SESSIONS))
+    assert scheduler.active_sessions() == 0
+
+
+def test_reschedule_to_none_disables_deadline(scheduler, clock):
+    closed = []
+    session_id = scheduler.schedule(60, lambda: closed.append(session_id))
+    assert scheduler.reschedule(session_id, None)
+    drive(scheduler, clock, clock.now + 3600, step=60)
+    assert closed == []
+    assert scheduler.active_sessions() == 1
+
+
+def test_idle_sessions_close_and_busy_sessions_stay(scheduler, clock, sampler):
+    policy = IdlePolicy(idle_seconds=600, sample_interval=30)
+    closed = {}
+    pids = range(10000, 10000 + SESSIONS)
+    sampler.busy.update(pid for pid in pids if pid % 2)
+    exited = {pid for pid in pids if pid % 10 == 0}
+    for pid in pids:
+        scheduler.schedule(None, (lambda p: lambda: closed.setdefault(p, clock.now))(pid),
+                           pids=[pid], idle_policy=policy)
+    start = clock.now
+
+    clock.advance(60)
+    scheduler.run_pending()
+    sampler.exited.update(exited)
+    drive(scheduler, clock, start + 3600, step=30)
+
+    idle = {pid for pid in pids if not pid % 2} - exited
+    assert set(closed) == idle
+    for closed_at in closed.values():
+        # 首次采样作为基准，之后持续空闲 idle_seconds 即关闭
+        assert start + policy.idle_seconds <= closed_at <= start + policy.idle_seconds + 2 * 30
+    # 忙碌的会话保留，已退出的会话结束但不调用关闭
+    assert scheduler.active_sessions() == len([pid for pid in pids if pid % 2])
+
+
+def test_idle_timer_resets_when_activity_resumes(scheduler, clock, sampler):
+    policy = IdlePolicy(idle_seconds=300, sample_interval=30)
+    closed = []
+    scheduler.schedule(None, lambda: closed.append(clock.now), pids=[1], idle_policy=policy)
+    start = clock.now
+
+    drive(scheduler, clock, start + 240, step=30)
+    sampler.busy.add(1)
+    drive(scheduler, clock, start + 300, step=30)
+    sampler.busy.discard(1)
+    assert closed == []
+
+    drive(scheduler, clock, start + 1000, step=30)
+    assert len(closed) == 1 and closed[0] >= start + 300 + 300
+
+
+def test_deadline_and_idle_policy_close_once(scheduler, clock, sampler):
+    policy = IdlePolicy(idle_seconds=300, sample_interval=30)
+    closed = []
+    scheduler.schedule(200, lambda: closed.append(clock.now), pids=[1], idle_policy=policy)
+    drive(scheduler, clock, clock.now + 1000, step=10)
+    assert len(closed) == 1
+    assert scheduler.active_sessions() == 0
+
+
+def test_callback_may_call_back_into_scheduler(scheduler, clock):
+    follow_up = []
+
+    def on_close():
+        follow_up.append(scheduler.schedule(60, lambda: None))
+
+    scheduler.schedule(10, on_close)
+    drive(scheduler, clock, clock.now + 20)
+    assert len(follow_up) == 1 and scheduler.active_sessions() == 1
+
+
+def test_thread_count_independent_of_sessions(clock, sampler):
+    before = threading.active_count()
+    scheduler = AutoCloseScheduler(clock=clock, sampler=sampler)
+    for _ in range(SESSIONS):
+        scheduler.schedule(600, lambda: None, pids=[1], idle_policy=IdlePolicy(300))
+    assert threading.active_count() == before
+
+    scheduler.start()
+    try:
+        for _ in range(SESSIONS):
+            scheduler.schedule(600, lambda: None)
+        assert threading.active_count() == before + 1
+        drive(scheduler, clock, clock.now + 1200, step=60)
+        assert threading.active_count() == before + 1
+    finally:
+        scheduler.stop(timeout=5)
+    assert threading.active_count() == before
@@ -0,0 +1,92 @@
+import pytest
+
+from notification_service import NotificationDispatcher, NotificationQueue
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class RefusingSMTP:
+    def __init__(self):
+        self.connections = 0
+
+    def __call__(self, config):
+        self.connections += 1
+        raise ConnectionRefusedError('offline')
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = NotificationQueue(str(tmp_path / 'print_records.db'), clock=clock)
+    yield queue
+    queue.close()
+
+
+def attempts_of(queue):
+    return [row['attempts'] for row in queue._connect().execute('SELECT attempts FROM notifications')]
+
+
+def test_retry_within_batch_window_is_not_claimed_early(tmp_path, queue, clock):
+    refuse = RefusingSMTP()
+    dispatcher = NotificationDispatcher(queue, {}, batch_window=60, max_attempts=4, base_backoff=60,
+                                        dead_letter_file=str(tmp_path / 'dead.jsonl'), smtp_factory=refuse)
+    queue.enqueue(clock.now, 'nobody@example.com', '测试', '测试项目', '00000000')
+
+    dispatcher.dispatch_due()
+    assert refuse.connections == 1
+    assert attempts_of(queue) == [1]
+    assert queue.next_due() == clock.now + 60
+
+    # 退避时间未到，再次调用也不会重试
+    clock.now += 30
+    dispatcher.dispatch_due()
+    assert refuse.connections == 1
+
+    clock.now += 30
+    dispatcher.dispatch_due()
+    assert refuse.connections == 2
+    assert attempts_of(queue) == [2]
+    assert queue.next_due() == clock.now + 120
+
+
+def test_first_attempts_within_batch_window_share_a_batch(tmp_path, queue, clock):
+    refuse = RefusingSMTP()
+    dispatcher = NotificationDispatcher(queue, {}, batch_window=60, base_backoff=60,
+                                        dead_letter_file=str(tmp_path / 'dead.jsonl'), smtp_factory=refuse)
+    for offset in (0, 20, 59, 61):
+        queue.enqueue(clock.now + offset, 'nobody@example.com', '测试', '测试项目', '00000000')
+
+    dispatcher.dispatch_due()
+    assert refuse.connections == 1
+    assert sorted(attempts_of(queue)) == [0, 1, 1, 1]
+
+
+def test_retries_end_in_dead_letters(tmp_path, queue, clock):
+    refuse = RefusingSMTP()
+    dead_letters = tmp_path / 'dead.jsonl'
+    dispatcher = NotificationDispatcher(queue, {}, batch_window=60, max_attempts=4, base_backoff=60,
+                                        dead_letter_file=str(dead_letters), smtp_factory=refuse)
+    queue.enqueue(clock.now, 'nobody@example.com', '测试', '测试项目', '00000000')
+
+    backoff = []
+    while True:
+        dispatcher.dispatch_due()
+        next_due = queue.next_due()
+        if next_due is None:
+            break
+        backoff.append(next_due - clock.now)
+        clock.now = next_due
+
+    assert backoff == [60, 120, 240]
+    assert refuse.connections == 4
+    assert len(dead_letters.read_text(encoding='utf-8').splitlines()) == 1
@@ -0,0 +1,112 @@
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+import psutil
+import pytest
+
+from process_monitor import ProcessMonitor
+
+SLEEP = shutil.which('sleep')
+
+pytestmark = pytest.mark.skipif(sys.platform == 'win32' or not SLEEP, reason='需要 POSIX sleep')
+
+
+@pytest.fixture
+def fake_slicer(tmp_path):
+    """复制 sleep 作为独立进程名的“切片软件”"""
+    path = tmp_path / 'fakeslicer'
+    shutil.copy(SLEEP, path)
+    os.chmod(path, 0o755)
+    children = []
+
+    def spawn():
+        child = subprocess.Popen([str(path), '60'])
+        children.append(child)
+        return child
+
+    yield path.name, spawn
+    for child in children:
+        child.kill()
+        child.wait()
+
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_scan_finds_untracked_instances(fake_slicer):
+    name, spawn = fake_slicer
+    monitor = ProcessMonitor(name, poll_interval=0.05, full_scan_interval=3600)
+    monitor.start()
+    try:
+        assert not monitor.is_running
+        child = spawn()
+        # 没有 track() 时要等到下一次完整扫描，scan() 立即可见
+        assert wait_until(lambda: child.pid in monitor.scan())
+        assert not monitor.is_running
+        monitor.refresh()
+        assert wait_until(lambda: monitor.is_running)
+    finally:
+        monitor.stop()
+
+
+def test_reused_pid_is_reported_exited(fake_slicer):
+    name, spawn = fake_slicer
+    child = spawn()
+    monitor = ProcessMonitor(name, poll_interval=0.05, full_scan_interval=3600)
+    monitor.start()
+    try:
+        assert monitor.running_pids == {child.pid}
+        events = []
+        monitor.subscribe(lambda event, snapshot: events.append(event))
+        # 模拟 PID 被复用：同一 PID 的创建时间与记录的不一致
+        monitor._pids[child.pid] = psutil.Process(child.pid).create_time() - 100
+        assert wait_until(lambda: not monitor.is_running)
+        assert events == [ProcessMonitor.EXITED]
+    finally:
+        monitor.stop()
+
+
+def test_is_alive_rejects_reused_pid(fake_slicer):
+    name, spawn = fake_slicer
+    child = spawn()
+    monitor = ProcessMonitor(name)
+    monitor._pids = monitor.scan()
+    assert monitor.is_alive(child.pid)
+    assert not monitor.is_alive(child.pid + 100000)
+    monitor._pids[child.pid] -= 100
+    assert not monitor.is_alive(child.pid)
+
+
+def test_close_app_skips_stale_snapshot_pid(fake_slicer, tmp_path, monkeypatch):
+    from app_controller import AppController
+
+    name, spawn = fake_slicer
+    slicer = spawn()
+    bystander_path = tmp_path / 'bystander'
+    shutil.copy(SLEEP, bystander_path)
+    bystander = subprocess.Popen([str(bystander_path), '60'])
+    monkeypatch.chdir(tmp_path)
+    controller = AppController(name, app_path=str(tmp_path / name))
+    try:
+        controller.monitor.stop()
+        # 快照过时：切片软件曾经使用的 PID 已被无关进程复用
+        controller.monitor._pids = {slicer.pid: psutil.Process(slicer.pid).create_time(),
+                                    bystander.pid: psutil.Process(bystander.pid).create_time() - 100}
+        controller.monitor._publish()
+
+        assert controller.close_app(name)
+        assert slicer.wait(timeout=5) is not None
+        assert bystander.poll() is None
+    finally:
+        controller.scheduler.stop(timeout=5)
+        bystander.kill()
+        bystander.wait()
@@ -0,0 +1,162 @@
+import csv
+import sqlite3
+import threading
+
+import pytest
+
+from record_store import RecordStore
+
+HEADERS = ['timestamp', 'user_name', 'project_name', 'student_id', 'status']
+
+
+def write_csv(path, rows, headers=HEADERS, mode='w'):
+    with open(path, mode, newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        if mode == 'w':
+            writer.writerow(headers)
+        writer.writerows(rows)
+
+
+def row(index, student_id='20230001'):
+    return [f'2024-03-01 08:{index // 60:02d}:{index % 60:02d}', f'用户{index}', f'项目{index}',
+            student_id, '开始打印']
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RecordStore(str(tmp_path / 'print_records.db'))
+    yield store
+    store.close()
+
+
+@pytest.mark.parametrize('id_header', ['student_id', 'email'])
+def test_import_csv_reads_both_headers(tmp_path, store, id_header):
+    path = tmp_path / 'print_records.csv'
+    headers = HEADERS[:3] + [id_header] + HEADERS[4:]
+    write_csv(path, [row(0, '20230001'), row(1, '20230002')], headers)
+
+    assert store.import_csv(str(path)) == 2
+    assert [record['student_id'] for record in store.recent()] == ['20230001', '20230002']
+    assert store.recent()[0] == dict(zip(HEADERS, row(0, '20230001')))
+
+
+def test_second_import_is_a_no_op(tmp_path, store):
+    path = tmp_path / 'print_records.csv'
+    write_csv(path, [row(i) for i in range(3)])
+    assert store.import_csv(str(path)) == 3
+    assert store.import_csv(str(path)) == 0
+    assert store.count() == 3
+
+
+def test_reimport_after_append_only_adds_the_tail(tmp_path, store):
+    path = tmp_path / 'print_records.csv'
+    write_csv(path, [row(0), row(1)])
+    assert store.import_csv(str(path)) == 2
+
+    # 升级期间旧版终端继续向 CSV 追加
+    write_csv(path, [row(2)], mode='a')
+    assert store.import_csv(str(path)) == 1
+    assert [record['user_name'] for record in store.recent()] == ['用户0', '用户1', '用户2']
+
+
+def test_partial_last_line_is_left_for_the_next_import(tmp_path, store):
+    path = tmp_path / 'print_records.csv'
+    write_csv(path, [row(0)])
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('2024-03-01 09:00:00,用户1,项目')
+    assert store.import_csv(str(path)) == 1
+
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('1,20230001,开始打印\r\n')
+    assert store.import_csv(str(path)) == 1
+    assert store.recent()[-1]['project_name'] == '项目1'
+
+
+def test_editing_imported_rows_does_not_reimport(tmp_path, store):
+    path = tmp_path / 'print_records.csv'
+    write_csv(path, [row(0), row(1)])
+    store.import_csv(str(path))
+
+    write_csv(path, [row(0, '20239999'), row(1)])
+    assert store.import_csv(str(path)) == 0
+    assert store.count() == 2
+
+
+def test_shortened_file_does_not_reimport_and_picks_up_later_appends(tmp_path, store):
+    path = tmp_path / 'print_records.csv'
+    write_csv(path, [row(i) for i in range(3)])
+    store.import_csv(str(path))
+
+    # 管理员删掉了一行
+    write_csv(path, [row(0), row(2)])
+    assert store.import_csv(str(path)) == 0
+    write_csv(path, [row(3)], mode='a')
+    assert store.import_csv(str(path)) == 1
+    assert store.count() == 4
+
+
+def test_legacy_path_marker_counts_as_imported(tmp_path, store):
+    path = tmp_path / 'print_records.csv'
+    write_csv(path, [row(0)])
+    conn = store._connect()
+    with conn:
+        conn.execute('INSERT INTO meta (key, value) VALUES (?, ?)', (f'csv_imported:{path}', '1'))
+
+    assert store.import_csv(str(path)) == 0
+    write_csv(path, [row(1)], mode='a')
+    assert store.import_csv(str(path)) == 1
+
+
+def test_recent_and_history_are_in_write_order(store):
+    # 时间戳故意乱序，结果按写入顺序而不是时间戳排列
+    for index in (5, 1, 4, 2, 3):
+        store.append(*row(index, '20230001' if index % 2 else '20230002'))
+
+    assert [record['user_name'] for record in store.recent(3)] == ['用户4', '用户2', '用户3']
+    assert [record['user_name'] for record in store.recent(100)] == ['用户5', '用户1', '用户4', '用户2', '用户3']
+    assert [record['user_name'] for record in store.history('20230001')] == ['用户5', '用户1', '用户3']
+    assert [record['user_name'] for record in store.history(user_name='用户4')] == ['用户4']
+    assert [record['user_name'] for record in store.history('20230002', '用户2')] == ['用户2']
+    assert len(store.history()) == 5
+
+
+def test_concurrent_terminals_share_one_data_directory(tmp_path):
+    db_path = str(tmp_path / 'print_records.db')
+    csv_path = tmp_path / 'print_records.csv'
+    write_csv(csv_path, [row(i) for i in range(500)])
+    RecordStore(db_path).close()
+
+    terminals = 4
+    appends = 200
+    barrier = threading.Barrier(terminals)
+    imported = []
+    errors = []
+
+    def terminal(number):
+        # 每个终端独立打开数据库，模拟多台机器共享同一数据目录
+        store = RecordStore(db_path)
+        try:
+            barrier.wait()
+            imported.append(store.import_csv(str(csv_path)))
+            for index in range(appends):
+                store.append(*row(index, f'9{number:07d}'))
+        except sqlite3.Error as e:
+            errors.append(e)
+        finally:
+            store.close()
+
+    threads = [threading.Thread(target=terminal, args=(number,)) for number in range(terminals)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(imported) == [0] * (terminals - 1) + [500]
+    store = RecordStore(db_path)
+    try:
+        assert store.count() == 500 + terminals * appends
+        for number in range(terminals):
+            assert len(store.history(f'9{number:07d}')) == appends
+    finally:
+        store.close()
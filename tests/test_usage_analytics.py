@@ -0,0 +1,105 @@
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+
+from record_store import RecordStore
+from usage_analytics import DIM_DAY, DIM_HOUR_OF_WEEK, DIM_PROJECT, DIM_STUDENT, UsageAnalytics
+from workload import RecordGenerator
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+DIMENSIONS = [DIM_DAY, DIM_STUDENT, DIM_PROJECT, DIM_HOUR_OF_WEEK]
+
+# CSV 导入只要求时间戳非空，这些格式都可能出现在旧数据中
+MALFORMED_TIMESTAMPS = [
+    '2024/03/10 10:00:00',
+    '2024-03-10T10:00:00',
+    '2024-3-10 9:00:00',
+    '2024-03-10 9',
+    '2024-02-30 10:00:00',
+    '2024-03-10 25:00:00',
+    '昨天下午',
+    'x',
+]
+
+
+# 不存在的日期或小时会让整批 datetime64 解析失败，分别测试有无这种时间戳
+IMPOSSIBLE_TIMESTAMPS = ['2024-02-30 10:00:00', '2024-03-10 25:00:00']
+
+
+@pytest.fixture(params=[MALFORMED_TIMESTAMPS,
+                        [ts for ts in MALFORMED_TIMESTAMPS if ts not in IMPOSSIBLE_TIMESTAMPS]],
+                ids=['impossible-dates', 'parseable-dates'])
+def store(tmp_path, request):
+    store = RecordStore(str(tmp_path / 'print_records.db'))
+    generator = RecordGenerator(seed=7, students=200, projects=50)
+    rng = random.Random(7)
+    for record in generator.records(3000):
+        if rng.random() < 0.05:
+            record[0] = rng.choice(request.param)
+        store.append(*record)
+    yield store
+    store.close()
+
+
+def rollups(analytics):
+    return {dim: sorted(analytics.rollup(dim)) for dim in DIMENSIONS}
+
+
+def test_numpy_rebuild_matches_python_rebuild(store):
+    pytest.importorskip('numpy')
+    analytics = UsageAnalytics(store.db_path)
+
+    assert analytics.rebuild(use_numpy=True) == 3000
+    with_numpy = rollups(analytics)
+    assert analytics.rebuild(use_numpy=False) == 3000
+    without_numpy = rollups(analytics)
+
+    assert with_numpy == without_numpy
+    assert sum(count for _, count in with_numpy[DIM_DAY]) == 3000
+    # 无法解析小时的记录不计入星期-小时分布
+    assert sum(count for _, count in with_numpy[DIM_HOUR_OF_WEEK]) < 3000
+    analytics.close()
+
+
+def test_incremental_catch_up_matches_rebuild(store):
+    analytics = UsageAnalytics(store.db_path)
+    assert analytics.catch_up() == 3000
+    incremental = rollups(analytics)
+    assert analytics.catch_up() == 0
+
+    analytics.rebuild()
+    assert rollups(analytics) == incremental
+    analytics.close()
+
+
+def test_large_backlog_is_rebuilt_in_bulk(store, monkeypatch):
+    monkeypatch.setattr(UsageAnalytics, 'REBUILD_THRESHOLD', 1000)
+    analytics = UsageAnalytics(store.db_path)
+    rebuilds = []
+    rebuild = analytics.rebuild
+    monkeypatch.setattr(analytics, 'rebuild', lambda: rebuilds.append(1) or rebuild())
+
+    assert analytics.catch_up() == 3000
+    assert rebuilds == [1]
+    bulk = rollups(analytics)
+
+    # 积压少于阈值时逐条累加
+    for record in RecordGenerator(seed=8, students=20, projects=5).records(500):
+        store.append(*record)
+    assert analytics.catch_up() == 500
+    assert rebuilds == [1]
+    incremental = rollups(analytics)
+
+    rebuild(use_numpy=False)
+    assert rollups(analytics) == incremental != bulk
+    analytics.close()
+
+
+def test_importing_data_manager_does_not_import_numpy():
+    code = 'import sys, data_manager; sys.exit("numpy" in sys.modules)'
+    result = subprocess.run([sys.executable, '-c', code], cwd=os.path.join(ROOT, '.venv'))
+    assert result.returncode == 0